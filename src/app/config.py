@@ -1,19 +1,38 @@
 from __future__ import annotations
 
 import os
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 
+# Defaults applied when the corresponding env var is unset
+DEFAULT_APP_ENV = "local"
+DEFAULT_PAPER_TRADING = "true"
+DEFAULT_TELEGRAM_ADMINS = ""
 
-@dataclass
+# Matches one whole comma-separated run of digits (surrounding whitespace allowed)
+_ADMIN_ID_PATTERN = re.compile(r"(?:^|,)\s*(\d+)\s*(?=,|$)")
+
+
+@dataclass(frozen=True)
 class AppConfig:
     env: str
     paper_trading: bool
-    telegram_admins: list[int]
+    telegram_admins: frozenset[int]
 
 
+@lru_cache(maxsize=1)
 def load_config() -> AppConfig:
-    env = os.getenv("APP_ENV", "local")
-    paper_trading = os.getenv("PAPER_TRADING", "true").lower() == "true"
-    admins_raw = os.getenv("TELEGRAM_ADMINS", "")
-    admins = [int(value) for value in admins_raw.split(",") if value.strip().isdigit()]
+    """Load configuration from the environment once; use reload_config() to re-read it."""
+    environ = os.environ
+    env = environ.get("APP_ENV", DEFAULT_APP_ENV)
+    paper_trading = environ.get("PAPER_TRADING", DEFAULT_PAPER_TRADING).lower() == "true"
+    admins_raw = environ.get("TELEGRAM_ADMINS", DEFAULT_TELEGRAM_ADMINS)
+    admins = frozenset(map(int, _ADMIN_ID_PATTERN.findall(admins_raw)))
     return AppConfig(env=env, paper_trading=paper_trading, telegram_admins=admins)
+
+
+def reload_config() -> AppConfig:
+    """Drop the cached config and re-read it from the environment."""
+    load_config.cache_clear()
+    return load_config()
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from polymarket.client import PolymarketClient
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HealthStatus:
     status: str
     mode: str
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from app.config import load_config
+from app.config import AppConfig, load_config
 from app.logging import configure_logging
 from execution.engine import ExecutionEngine
 from risk.engine import RiskEngine
@@ -9,19 +9,25 @@ from telegram.auth import TelegramAuth
 from telegram.bot import TelegramBot
 
 
-def build_app() -> TelegramBot:
-    config = load_config()
+def build_app(config: AppConfig | None = None) -> TelegramBot:
+    # load_config() is memoized; call reload_config() after changing env vars,
+    # or pass an explicit config
+    if config is None:
+        config = load_config()
     configure_logging()
     # TODO: Wire polymarket.client.PolymarketClient when API integration is complete
     risk = RiskEngine()
     signals = SignalEngine()
-    auth = TelegramAuth(admin_ids=set(config.telegram_admins))
-    bot = TelegramBot(auth=auth, risk=risk, signals=signals)
+    auth = TelegramAuth(admin_ids=config.telegram_admins)
     execution = ExecutionEngine()
     execution.set_paper(config.paper_trading)
-    return bot
+    # The bot owns shutdown: bot.close() flushes batched order writes and closes storage
+    return TelegramBot(auth=auth, risk=risk, signals=signals, execution=execution)
 
 
 if __name__ == "__main__":
     bot = build_app()
-    print(bot.handle_message(0, "/status"))
+    try:
+        print(bot.handle_message(0, "/status"))
+    finally:
+        bot.close()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-import uuid
+import itertools
+import os
+import time
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
@@ -10,6 +13,7 @@ from execution.slippage import within_slippage
 from risk.engine import RiskDecision
 from risk.limits import RiskLimits
 from signals.types import Signal
+from utils.time import parse_stored_timestamp
 
 if TYPE_CHECKING:
     from storage.db import Database
@@ -19,15 +23,30 @@ if TYPE_CHECKING:
 DEFAULT_ORDER_SIZE = 10.0
 DEFAULT_MAX_SLIPPAGE = 0.02  # 2%
 
+# Confidence scaling: linear from 0.5x at 0.6 confidence to 2x at 1.0 confidence,
+# folded into factor = CONFIDENCE_OFFSET + confidence * CONFIDENCE_SCALE
+CONFIDENCE_SCALE = 1.5 / 0.4
+CONFIDENCE_OFFSET = 0.5 - 0.6 * CONFIDENCE_SCALE
+MIN_CONFIDENCE_FACTOR = 0.5
+MAX_CONFIDENCE_FACTOR = 2.0
 
-@dataclass
+# Order ids are "<prefix>-<counter>": the prefix (pid + process start time) keeps ids
+# unique across restarts that reuse a pid; the counter is shared by all engines
+_ORDER_ID_PREFIX = f"order-{os.getpid():x}{int(time.time()):x}"
+_order_counter = itertools.count(1)
+
+# (strategy, market_id, outcome_id, action); stringified only when persisted
+IdempotencyKey = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
 class ExecutionResult:
     order: ExecutionOrder | None
     status: str
     reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderSizing:
     """Parameters for order sizing calculation."""
     base_size: float = DEFAULT_ORDER_SIZE
@@ -42,13 +61,16 @@ class ExecutionEngine:
         db: Database | None = None,
         limits: RiskLimits | None = None,
         sizing: OrderSizing | None = None,
+        persist_paper: bool = True,
     ) -> None:
         self.db = db
         self.limits = limits or RiskLimits()
         self.sizing = sizing or OrderSizing()
         self.paper = True
+        # When False, paper orders stay in memory even with a database (e.g. backtests)
+        self.persist_paper = persist_paper
         # In-memory fallback for idempotency (use DB when available)
-        self._idempotency_keys: set[str] = set()
+        self._idempotency_keys: set[IdempotencyKey] = set()
         self._open_orders: dict[str, ExecutionOrder] = {}
 
     def set_paper(self, paper: bool) -> None:
@@ -58,7 +80,7 @@ class ExecutionEngine:
 
     def _generate_order_id(self) -> str:
         """Generate unique order ID."""
-        return f"order-{uuid.uuid4().hex[:12]}"
+        return f"{_ORDER_ID_PREFIX}-{next(_order_counter):x}"
 
     def _calculate_order_size(self, signal: Signal) -> float:
         """Calculate order size based on signal and sizing rules."""
@@ -67,9 +89,11 @@ class ExecutionEngine:
         # Scale by confidence if enabled
         if self.sizing.confidence_scaling:
             # Higher confidence = larger position
-            # Scale from 0.5x at 0.6 confidence to 2x at 1.0 confidence
-            confidence_factor = 0.5 + (signal.confidence - 0.6) * (1.5 / 0.4)
-            confidence_factor = max(0.5, min(2.0, confidence_factor))
+            confidence_factor = CONFIDENCE_OFFSET + signal.confidence * CONFIDENCE_SCALE
+            if confidence_factor < MIN_CONFIDENCE_FACTOR:
+                confidence_factor = MIN_CONFIDENCE_FACTOR
+            elif confidence_factor > MAX_CONFIDENCE_FACTOR:
+                confidence_factor = MAX_CONFIDENCE_FACTOR
             size *= confidence_factor
 
         # Apply strategy cap if defined
@@ -101,24 +125,36 @@ class ExecutionEngine:
             pass
         return 0.5  # Default price
 
-    def _check_idempotency(self, key: str) -> bool:
-        """Check if idempotency key exists."""
-        if self.db:
-            return self.db.check_idempotency_key(key)
+    def _order_store(self) -> Database | None:
+        """Database that new orders go to, or None to keep them in memory."""
+        if self.paper and not self.persist_paper:
+            return None
+        return self.db
+
+    def _claim_idempotency(self, key: IdempotencyKey) -> bool:
+        """Record idempotency key; return False if it was already recorded."""
+        db = self._order_store()
+        if db:
+            # Committed together with the order row that submit() writes next
+            return db.claim_idempotency_key(":".join(key), commit=False)
+        if key in self._idempotency_keys:
+            return False
+        self._idempotency_keys.add(key)
+        return True
+
+    def _idempotency_claimed(self, key: IdempotencyKey) -> bool:
+        """Return True if the key is already recorded (read-only; does not claim it)."""
+        db = self._order_store()
+        if db:
+            return db.check_idempotency_key(":".join(key))
         return key in self._idempotency_keys
 
-    def _save_idempotency(self, key: str) -> None:
-        """Save idempotency key."""
-        if self.db:
-            self.db.add_idempotency_key(key)
-        else:
-            self._idempotency_keys.add(key)
-
     def submit(
         self,
         signal: Signal,
         decision: RiskDecision,
         current_price: float | None = None,
+        now: datetime | None = None,
     ) -> ExecutionResult:
         """Submit an order for execution.
 
@@ -126,29 +162,31 @@ class ExecutionEngine:
             signal: The trading signal
             decision: Risk decision (must be approved)
             current_price: Current market price for slippage check
+            now: Creation timestamp for the order (defaults to the current UTC time)
         """
         if not decision.approved:
             return ExecutionResult(order=None, status="rejected", reason=decision.reason)
 
-        # Generate idempotency key
-        key = f"{signal.strategy}:{signal.market_id}:{signal.outcome_id}:{signal.action}"
-        if self._check_idempotency(key):
-            return ExecutionResult(order=None, status="duplicate", reason="idempotent_key")
+        key = (signal.strategy, signal.market_id, signal.outcome_id, signal.action)
 
         # Calculate order parameters
         target_price = self._get_target_price(signal)
         order_size = self._calculate_order_size(signal)
 
-        # Check slippage if current price is provided
+        # Check slippage if current price is provided. A duplicate reports as a duplicate
+        # even when the price has moved, but a slippage rejection must not claim the key
         if current_price is not None and not within_slippage(target_price, current_price, DEFAULT_MAX_SLIPPAGE):
+            if self._idempotency_claimed(key):
+                return ExecutionResult(order=None, status="duplicate", reason="idempotent_key")
             return ExecutionResult(
                 order=None,
                 status="rejected",
                 reason=f"slippage_exceeded: target={target_price:.3f}, current={current_price:.3f}",
             )
 
-        # Save idempotency key BEFORE creating order (prevents duplicates on failure)
-        self._save_idempotency(key)
+        # Claim idempotency key BEFORE creating order (prevents duplicates on failure)
+        if not self._claim_idempotency(key):
+            return ExecutionResult(order=None, status="duplicate", reason="idempotent_key")
 
         # Create order
         order = ExecutionOrder(
@@ -159,12 +197,13 @@ class ExecutionEngine:
             price=target_price,
             size=order_size,
             status="paper" if self.paper else "submitted",
-            created_at=datetime.now(UTC),
+            created_at=now or datetime.now(UTC),
         )
 
         # Persist order
-        if self.db:
-            self.db.save_order(
+        db = self._order_store()
+        if db:
+            db.save_order(
                 order_id=order.order_id,
                 market_id=order.market_id,
                 outcome_id=order.outcome_id,
@@ -173,28 +212,60 @@ class ExecutionEngine:
                 size=order.size,
                 status=order.status,
                 strategy=signal.strategy,
+                created_at=order.created_at,
             )
         else:
             self._open_orders[order.order_id] = order
 
         return ExecutionResult(order=order, status="submitted", reason="ok")
 
+    def submit_many(
+        self,
+        signals: Sequence[Signal],
+        decisions: Sequence[RiskDecision],
+        current_prices: Sequence[float | None] | None = None,
+    ) -> list[ExecutionResult]:
+        """Submit a batch of orders, e.g. the output of RiskEngine.batch_evaluate.
+
+        All orders in the batch share one creation timestamp.
+        """
+        if current_prices is None:
+            current_prices = [None] * len(signals)
+        now = datetime.now(UTC)
+        return [
+            self.submit(signal, decision, current_price, now=now)
+            for signal, decision, current_price in zip(signals, decisions, current_prices, strict=True)
+        ]
+
+    def flush(self) -> None:
+        """Commit batched order writes."""
+        if self.db:
+            self.db.flush()
+
+    def close(self) -> None:
+        """Commit batched order writes and close the database; call on shutdown."""
+        if self.db:
+            self.db.close()
+
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an open order."""
-        if self.db:
-            self.db.update_order_status(order_id, "cancelled")
-            return True
         if order_id in self._open_orders:
             del self._open_orders[order_id]
             return True
+        if self.db:
+            self.db.update_order_status(order_id, "cancelled")
+            return True
         return False
 
     def get_open_orders(self) -> list[ExecutionOrder]:
         """Get all open orders."""
+        return list(self.iter_open_orders())
+
+    def iter_open_orders(self) -> Iterator[ExecutionOrder]:
+        """Yield open orders one at a time (streams rows when backed by a database)."""
         if self.db:
-            order_dicts = self.db.get_open_orders()
-            return [
-                ExecutionOrder(
+            for o in self.db.iter_open_orders():
+                yield ExecutionOrder(
                     order_id=o["order_id"],
                     market_id=o["market_id"],
                     outcome_id=o["outcome_id"],
@@ -202,8 +273,6 @@ class ExecutionEngine:
                     price=o["price"],
                     size=o["size"],
                     status=o["status"],
-                    created_at=datetime.fromisoformat(o["created_at"]),
+                    created_at=parse_stored_timestamp(o["created_at"]),
                 )
-                for o in order_dicts
-            ]
-        return list(self._open_orders.values())
+        yield from list(self._open_orders.values())
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from math import fabs
+
 
 def within_slippage(expected_price: float, actual_price: float, max_slippage: float) -> bool:
-    if expected_price <= 0:
-        return False
-    slippage = abs(actual_price - expected_price) / expected_price
-    return slippage <= max_slippage
+    # Compare against max_slippage * expected_price to avoid a division
+    return expected_price > 0.0 and fabs(actual_price - expected_price) <= max_slippage * expected_price
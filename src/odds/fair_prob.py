@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import math
 from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FairProbability:
     outcome: str
     implied: float
@@ -15,14 +16,23 @@ class FairProbability:
 
 
 def devig(implied_probs: Iterable[float]) -> list[float]:
-    total = sum(implied_probs)
-    if total == 0:
-        return [0 for _ in implied_probs]
-    return [prob / total for prob in implied_probs]
+    probs = list(implied_probs)
+    total = math.fsum(probs)
+    if total == 0.0:
+        return [0.0] * len(probs)
+    inverse = 1.0 / total
+    return [prob * inverse for prob in probs]
+
+
+def time_decay(time_to_event_hours: float) -> float:
+    return max(0.1, min(1.0, time_to_event_hours / 72))
 
 
 def confidence_from_edge(edge: float, time_to_event_hours: float) -> float:
-    decay = max(0.1, min(1.0, time_to_event_hours / 72))
+    return _confidence(edge, time_decay(time_to_event_hours))
+
+
+def _confidence(edge: float, decay: float) -> float:
     return max(0.0, min(1.0, abs(edge) * decay))
 
 
@@ -31,18 +41,16 @@ def build_fair_probabilities(
     time_to_event_hours: float,
     captured_at: datetime,
 ) -> list[FairProbability]:
+    # Decay depends only on the event time, so compute it once for all outcomes
+    decay = time_decay(time_to_event_hours)
     fair_probs = devig(implied.values())
-    items = list(implied.items())
-    results: list[FairProbability] = []
-    for (outcome, implied_prob), fair_prob in zip(items, fair_probs, strict=True):
-        edge = fair_prob - implied_prob
-        results.append(
-            FairProbability(
-                outcome=outcome,
-                implied=implied_prob,
-                fair=fair_prob,
-                captured_at=captured_at,
-                confidence=confidence_from_edge(edge, time_to_event_hours),
-            )
+    return [
+        FairProbability(
+            outcome=outcome,
+            implied=implied_prob,
+            fair=fair_prob,
+            captured_at=captured_at,
+            confidence=_confidence(fair_prob - implied_prob, decay),
         )
-    return results
+        for (outcome, implied_prob), fair_prob in zip(implied.items(), fair_probs, strict=True)
+    ]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 
 def american_to_implied_prob(odds: int) -> float:
     if odds == 0:
@@ -13,3 +15,25 @@ def decimal_to_implied_prob(decimal_odds: float) -> float:
     if decimal_odds <= 1:
         raise ValueError("Decimal odds must be > 1")
     return 1 / decimal_odds
+
+
+def american_to_implied_probs(odds: Iterable[int]) -> list[float]:
+    """Convert a batch of American odds, e.g. every line from one provider refresh."""
+    probs: list[float] = []
+    append = probs.append
+    for value in odds:
+        if value > 0:
+            append(100 / (value + 100))
+        elif value < 0:
+            append(-value / (100 - value))
+        else:
+            raise ValueError("American odds cannot be zero")
+    return probs
+
+
+def decimal_to_implied_probs(decimal_odds: Iterable[float]) -> list[float]:
+    """Convert a batch of decimal odds."""
+    odds = list(decimal_odds)
+    if any(value <= 1 for value in odds):
+        raise ValueError("Decimal odds must be > 1")
+    return [1 / value for value in odds]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime
 
@@ -12,11 +13,15 @@ class ClientConfig:
     api_key: str | None
     wallet_address: str | None
     paper: bool = True
+    # Seconds a fetched market list is reused; 0 disables caching
+    market_cache_ttl: float = 1.0
 
 
 class PolymarketClient:
     def __init__(self, config: ClientConfig) -> None:
         self.config = config
+        # (monotonic fetch time, markets, id -> market index) from the last fetch
+        self._markets_cache: tuple[float, list[Market], dict[str, Market]] | None = None
 
     @classmethod
     def from_env(cls) -> PolymarketClient:
@@ -29,19 +34,36 @@ class PolymarketClient:
             )
         )
 
+    def _cached_markets(self) -> tuple[list[Market], dict[str, Market]]:
+        """Return the cached markets and their id index, refetching once the TTL has passed."""
+        now = time.monotonic()
+        cached = self._markets_cache
+        if cached is not None and now - cached[0] < self.config.market_cache_ttl:
+            return cached[1], cached[2]
+        markets = self._fetch_markets()
+        index = {market.id: market for market in markets}
+        self._markets_cache = (now, markets, index)
+        return markets, index
+
     def get_markets(self) -> list[Market]:
+        return list(self._cached_markets()[0])
+
+    def invalidate(self) -> None:
+        """Drop cached markets so the next lookup fetches a fresh list."""
+        self._markets_cache = None
+
+    def _fetch_markets(self) -> list[Market]:
         return [
             Market(
                 id="demo-market",
                 question="Will Team A win?",
-                outcomes=[Outcome(id="yes", name="Yes", price=0.52), Outcome(id="no", name="No", price=0.48)],
+                outcomes=(Outcome(id="yes", name="Yes", price=0.52), Outcome(id="no", name="No", price=0.48)),
                 active=True,
             )
         ]
 
     def get_market(self, market_id: str) -> Market:
-        markets = {market.id: market for market in self.get_markets()}
-        return markets[market_id]
+        return self._cached_markets()[1][market_id]
 
     def place_order(self, order: Order) -> Order:
         return Order(
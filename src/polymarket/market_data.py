@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 
@@ -7,7 +8,7 @@ from polymarket.client import PolymarketClient
 from polymarket.models import Market
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketSnapshot:
     market: Market
     captured_at: datetime
@@ -18,5 +19,10 @@ class MarketDataService:
         self.client = client
 
     def snapshot(self) -> list[MarketSnapshot]:
+        return list(self.iter_snapshots())
+
+    def iter_snapshots(self) -> Iterator[MarketSnapshot]:
+        """Yield snapshots one at a time so callers can stop early."""
         now = datetime.now(UTC)
-        return [MarketSnapshot(market=market, captured_at=now) for market in self.client.get_markets()]
+        for market in self.client.get_markets():
+            yield MarketSnapshot(market=market, captured_at=now)
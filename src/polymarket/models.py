@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
@@ -10,14 +11,19 @@ def _utc_now() -> datetime:
     return datetime.now(UTC)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Outcome:
     id: str
     name: str
     price: float
 
+    def __post_init__(self) -> None:
+        # Outcome ids/names repeat across every poll; share one string object per value
+        object.__setattr__(self, "id", sys.intern(self.id))
+        object.__setattr__(self, "name", sys.intern(self.name))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Market:
     id: str
     question: str
@@ -25,8 +31,11 @@ class Market:
     active: bool
     close_time: datetime | None = None
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "id", sys.intern(self.id))
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Order:
     id: str
     market_id: str
@@ -38,7 +47,7 @@ class Order:
     created_at: datetime = field(default_factory=_utc_now)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Fill:
     id: str
     order_id: str
@@ -49,7 +58,7 @@ class Fill:
     timestamp: datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Position:
     market_id: str
     outcome_id: str
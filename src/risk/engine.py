@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 
 from risk.limits import RiskLimits
 from signals.types import Signal
@@ -8,13 +9,37 @@ from signals.types import Signal
 # Minimum confidence threshold for trade approval
 MIN_CONFIDENCE_THRESHOLD = 0.6
 
+# RiskLimits fields settable through set_limit(), with the type each value is stored as
+_LIMIT_FIELDS: dict[str, Callable[[float], float]] = {
+    "max_position_size": float,
+    "max_order_size": float,
+    "max_open_positions": int,
+    "max_daily_loss": float,
+}
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class RiskDecision:
     approved: bool
     reason: str
 
 
+# Decisions are immutable, so every evaluation returns one of these shared instances
+_APPROVED = RiskDecision(True, "approved")
+_REJECTIONS = {
+    reason: RiskDecision(False, reason)
+    for reason in (
+        "global_kill_switch",
+        "max_daily_loss_exceeded",
+        "order_size_exceeded",
+        "max_position_size_exceeded",
+        "max_open_positions",
+        "strategy_cap_exceeded",
+        "confidence_below_threshold",
+    )
+}
+
+
 @dataclass
 class RiskState:
     """Tracks current risk state for evaluation."""
@@ -40,20 +65,18 @@ class RiskEngine:
     def set_limit(self, param: str, value: float) -> bool:
         if value < 0:
             return False
+        convert = _LIMIT_FIELDS.get(param)
+        # RiskLimits is frozen (so instances can be shared); swap in an updated copy
+        if convert is not None:
+            self.limits = replace(self.limits, **{param: convert(value)})
+            return True
         if param.startswith("strategy."):
-            strategy = param.split("strategy.", 1)[1]
+            strategy = param[len("strategy."):]
             if not strategy:
                 return False
-            if self.limits.strategy_caps is None:
-                self.limits.strategy_caps = {}
-            self.limits.strategy_caps[strategy] = value
-            return True
-        if hasattr(self.limits, param):
-            current = getattr(self.limits, param)
-            if isinstance(current, int):
-                setattr(self.limits, param, int(value))
-            else:
-                setattr(self.limits, param, value)
+            caps = dict(self.limits.strategy_caps or {})
+            caps[strategy] = value
+            self.limits = replace(self.limits, strategy_caps=caps)
             return True
         return False
 
@@ -74,36 +97,49 @@ class RiskEngine:
             order_size: Size of the proposed order
             position_size: Current position size in this market
         """
+        rejection = self._limit_rejection(current_positions, daily_pnl, order_size, position_size)
+        if rejection is not None:
+            return rejection
+
+        # Strategy-specific cap check (the cap only matters for a sized order)
+        if order_size > 0 and order_size > self.limits.cap_for_strategy(signal.strategy):
+            return _REJECTIONS["strategy_cap_exceeded"]
+
+        # Confidence threshold check
+        if signal.confidence < MIN_CONFIDENCE_THRESHOLD:
+            return _REJECTIONS["confidence_below_threshold"]
+
+        return _APPROVED
+
+    def _limit_rejection(
+        self,
+        current_positions: int,
+        daily_pnl: float,
+        order_size: float,
+        position_size: float,
+    ) -> RiskDecision | None:
+        """Return the rejection for the first failing signal-independent check, or None."""
         # Kill switch check
         if not self.trading_enabled:
-            return RiskDecision(False, "global_kill_switch")
+            return _REJECTIONS["global_kill_switch"]
 
         # Daily loss limit check
         if daily_pnl <= -self.limits.max_daily_loss:
-            return RiskDecision(False, "max_daily_loss_exceeded")
+            return _REJECTIONS["max_daily_loss_exceeded"]
 
         # Order size check
         if order_size > 0 and order_size > self.limits.max_order_size:
-            return RiskDecision(False, "order_size_exceeded")
+            return _REJECTIONS["order_size_exceeded"]
 
         # Position size check (existing + new order)
         if position_size + order_size > self.limits.max_position_size:
-            return RiskDecision(False, "max_position_size_exceeded")
+            return _REJECTIONS["max_position_size_exceeded"]
 
         # Open positions limit check
         if current_positions >= self.limits.max_open_positions:
-            return RiskDecision(False, "max_open_positions")
-
-        # Strategy-specific cap check
-        strategy_cap = self.limits.cap_for_strategy(signal.strategy)
-        if order_size > 0 and order_size > strategy_cap:
-            return RiskDecision(False, "strategy_cap_exceeded")
-
-        # Confidence threshold check
-        if signal.confidence < MIN_CONFIDENCE_THRESHOLD:
-            return RiskDecision(False, "confidence_below_threshold")
+            return _REJECTIONS["max_open_positions"]
 
-        return RiskDecision(True, "approved")
+        return None
 
     def evaluate_simple(self, signal: Signal, current_positions: int) -> RiskDecision:
         """Simplified evaluation for backward compatibility."""
@@ -117,11 +153,14 @@ class RiskEngine:
         """Evaluate multiple signals against risk limits."""
         if risk_state is None:
             risk_state = RiskState()
+        # With no order or position size the portfolio checks are identical for
+        # every signal (and the strategy cap cannot trip), so run them once
+        rejection = self._limit_rejection(risk_state.current_positions, risk_state.daily_pnl, 0.0, 0.0)
+        if rejection is not None:
+            return [rejection] * len(signals)
         return [
-            self.evaluate(
-                signal,
-                current_positions=risk_state.current_positions,
-                daily_pnl=risk_state.daily_pnl,
-            )
+            _APPROVED
+            if signal.confidence >= MIN_CONFIDENCE_THRESHOLD
+            else _REJECTIONS["confidence_below_threshold"]
             for signal in signals
         ]
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RiskLimits:
     max_position_size: float = 100.0
     max_order_size: float = 50.0
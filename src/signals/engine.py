@@ -23,7 +23,9 @@ class SignalEngine:
         ]
 
     def evaluate(self) -> SignalBatch:
+        # One clock read per batch; every signal is stamped with the batch time
+        now = datetime.now(UTC)
         signals: list[Signal] = []
         for strategy in self.strategies:
-            signals.extend(strategy.generate())
-        return SignalBatch(signals=signals, created_at=datetime.now(UTC))
+            signals.extend(strategy.generate(now))
+        return SignalBatch(signals=signals, created_at=now)
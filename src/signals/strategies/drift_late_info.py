@@ -8,7 +8,7 @@ from signals.types import Signal
 class LateInfoDriftStrategy:
     name = "late_information_drift"
 
-    def generate(self) -> list[Signal]:
+    def generate(self, now: datetime | None = None) -> list[Signal]:
         return [
             Signal(
                 strategy=self.name,
@@ -17,6 +17,6 @@ class LateInfoDriftStrategy:
                 action="buy",
                 confidence=0.57,
                 explanation={"drift": 0.02, "time_to_event_hours": 6},
-                created_at=datetime.now(UTC),
+                created_at=now or datetime.now(UTC),
             )
         ]
@@ -8,7 +8,7 @@ from signals.types import Signal
 class HedgedPortfolioStrategy:
     name = "hedged_portfolio"
 
-    def generate(self) -> list[Signal]:
+    def generate(self, now: datetime | None = None) -> list[Signal]:
         return [
             Signal(
                 strategy=self.name,
@@ -17,6 +17,6 @@ class HedgedPortfolioStrategy:
                 action="buy",
                 confidence=0.45,
                 explanation={"hedge_ratio": 0.6, "note": "correlated_outcomes"},
-                created_at=datetime.now(UTC),
+                created_at=now or datetime.now(UTC),
             )
         ]
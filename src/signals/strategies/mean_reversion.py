@@ -8,7 +8,7 @@ from signals.types import Signal
 class MeanReversionStrategy:
     name = "mean_reversion"
 
-    def generate(self) -> list[Signal]:
+    def generate(self, now: datetime | None = None) -> list[Signal]:
         return [
             Signal(
                 strategy=self.name,
@@ -17,6 +17,6 @@ class MeanReversionStrategy:
                 action="buy",
                 confidence=0.5,
                 explanation={"z_score": -1.5, "note": "overreaction"},
-                created_at=datetime.now(UTC),
+                created_at=now or datetime.now(UTC),
             )
         ]
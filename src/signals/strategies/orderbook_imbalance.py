@@ -8,7 +8,7 @@ from signals.types import Signal
 class OrderbookImbalanceStrategy:
     name = "orderbook_imbalance"
 
-    def generate(self) -> list[Signal]:
+    def generate(self, now: datetime | None = None) -> list[Signal]:
         return [
             Signal(
                 strategy=self.name,
@@ -17,6 +17,6 @@ class OrderbookImbalanceStrategy:
                 action="sell",
                 confidence=0.55,
                 explanation={"bid_ask_ratio": 1.4, "note": "liquidity_shock"},
-                created_at=datetime.now(UTC),
+                created_at=now or datetime.now(UTC),
             )
         ]
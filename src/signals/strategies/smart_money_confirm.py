@@ -8,7 +8,7 @@ from signals.types import Signal
 class SmartMoneyConfirmStrategy:
     name = "smart_money_confirm"
 
-    def generate(self) -> list[Signal]:
+    def generate(self, now: datetime | None = None) -> list[Signal]:
         return [
             Signal(
                 strategy=self.name,
@@ -17,6 +17,6 @@ class SmartMoneyConfirmStrategy:
                 action="buy",
                 confidence=0.58,
                 explanation={"wallet_score": 0.8, "note": "top_wallets"},
-                created_at=datetime.now(UTC),
+                created_at=now or datetime.now(UTC),
             )
         ]
@@ -8,7 +8,7 @@ from signals.types import Signal
 class VegasValueStrategy:
     name = "vegas_value"
 
-    def generate(self) -> list[Signal]:
+    def generate(self, now: datetime | None = None) -> list[Signal]:
         return [
             Signal(
                 strategy=self.name,
@@ -17,6 +17,6 @@ class VegasValueStrategy:
                 action="buy",
                 confidence=0.62,
                 explanation={"edge": 0.03, "source": "vegas_vs_poly"},
-                created_at=datetime.now(UTC),
+                created_at=now or datetime.now(UTC),
             )
         ]
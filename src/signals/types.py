@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Signal:
     strategy: str
     market_id: str
@@ -14,8 +15,12 @@ class Signal:
     explanation: dict[str, float | str]
     created_at: datetime
 
+    def __post_init__(self) -> None:
+        # Actions come from a tiny fixed set; interning makes key hashing/equality pointer-cheap
+        object.__setattr__(self, "action", sys.intern(self.action))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SignalBatch:
     signals: list[Signal]
     created_at: datetime
@@ -7,9 +7,48 @@ from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
+from utils.time import parse_stored_timestamp, to_epoch_ns
+
 # Default database path
 DEFAULT_DB_PATH = "data/polysport.db"
 
+_ORDER_COLUMNS = (
+    "order_id, market_id, outcome_id, side, price, size, status, strategy, created_at, updated_at"
+)
+_ORDERS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        order_id TEXT PRIMARY KEY,
+        market_id TEXT NOT NULL,
+        outcome_id TEXT NOT NULL,
+        side TEXT NOT NULL,
+        price REAL NOT NULL,
+        size REAL NOT NULL,
+        status TEXT NOT NULL,
+        strategy TEXT,
+        created_at INTEGER NOT NULL,  -- epoch nanoseconds
+        updated_at TEXT NOT NULL
+    )
+"""
+_ORDERS_INDEXES_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+    CREATE INDEX IF NOT EXISTS idx_orders_market ON orders(market_id);
+"""
+
+# Statements on the order-submission path, shared so sqlite3's statement cache keys stay identical
+_OPEN_ORDERS_SQL = "SELECT * FROM orders WHERE status IN ('submitted', 'pending', 'paper')"
+_SAVE_ORDER_SQL = """
+    INSERT OR REPLACE INTO orders
+    (order_id, market_id, outcome_id, side, price, size, status, strategy, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_CLAIM_IDEMPOTENCY_SQL = """
+    INSERT INTO idempotency_keys (key, created_at, expires_at) VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        created_at = excluded.created_at,
+        expires_at = excluded.expires_at
+    WHERE idempotency_keys.expires_at < excluded.created_at
+"""
+
 
 def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
     """Create a database connection with proper settings."""
@@ -18,6 +57,12 @@ def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
+    # NORMAL is durable against corruption under WAL and skips the fsync on every commit
+    conn.execute("PRAGMA synchronous = NORMAL")
+    # ~20 MB page cache (negative values are KiB) keeps hot tables and indexes in memory
+    conn.execute("PRAGMA cache_size = -20000")
+    # Wait for another connection's write lock (e.g. get_connection()) instead of failing immediately
+    conn.execute("PRAGMA busy_timeout = 5000")
     return conn
 
 
@@ -37,7 +82,7 @@ def get_connection(db_path: str = DEFAULT_DB_PATH) -> Iterator[sqlite3.Connectio
 
 def init_schema(conn: sqlite3.Connection) -> None:
     """Initialize database schema with all required tables."""
-    conn.executescript("""
+    conn.executescript(f"""
         -- Risk state (singleton table for global trading state)
         CREATE TABLE IF NOT EXISTS risk_state (
             id INTEGER PRIMARY KEY CHECK (id = 1),
@@ -51,18 +96,7 @@ def init_schema(conn: sqlite3.Connection) -> None:
         VALUES (1, 0, 1, datetime('now'));
 
         -- Orders table
-        CREATE TABLE IF NOT EXISTS orders (
-            order_id TEXT PRIMARY KEY,
-            market_id TEXT NOT NULL,
-            outcome_id TEXT NOT NULL,
-            side TEXT NOT NULL,
-            price REAL NOT NULL,
-            size REAL NOT NULL,
-            status TEXT NOT NULL,
-            strategy TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
-        );
+        {_ORDERS_TABLE_SQL.format(table='orders')};
 
         -- Fills table for order executions
         CREATE TABLE IF NOT EXISTS fills (
@@ -112,27 +146,111 @@ def init_schema(conn: sqlite3.Connection) -> None:
         );
 
         -- Create indexes for common queries
-        CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
-        CREATE INDEX IF NOT EXISTS idx_orders_market ON orders(market_id);
+        {_ORDERS_INDEXES_SQL}
         CREATE INDEX IF NOT EXISTS idx_fills_order ON fills(order_id);
         CREATE INDEX IF NOT EXISTS idx_idempotency_expires ON idempotency_keys(expires_at);
         CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_log(timestamp);
     """)
     conn.commit()
+    _migrate_orders_created_at(conn)
+
+
+def _legacy_created_at_ns(value: int | str) -> int:
+    """Epoch nanoseconds for a created_at read from a TEXT column (ISO text or digit string)."""
+    if isinstance(value, int):
+        return value
+    if value.isdigit():
+        return int(value)
+    parsed = parse_stored_timestamp(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return to_epoch_ns(parsed)
+
+
+def _migrate_orders_created_at(conn: sqlite3.Connection) -> None:
+    """Rebuild an orders table created before created_at became INTEGER epoch nanoseconds.
+
+    CREATE TABLE IF NOT EXISTS leaves an existing TEXT column in place, and TEXT affinity
+    would turn new integer values into digit strings, so convert the table once.
+    """
+    column_types = {row[1]: row[2].upper() for row in conn.execute("PRAGMA table_info(orders)")}
+    if column_types.get("created_at") != "TEXT":
+        return
+
+    rows = conn.execute(f"SELECT {_ORDER_COLUMNS} FROM orders").fetchall()
+    converted = [(*row[:8], _legacy_created_at_ns(row[8]), row[9]) for row in rows]
+    # SQLite's table-rebuild procedure: foreign keys (fills -> orders) must be off while
+    # the old table is dropped, and the pragma only takes effect outside a transaction
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN")
+        conn.execute(_ORDERS_TABLE_SQL.format(table="orders_migrated"))
+        conn.executemany(
+            f"INSERT INTO orders_migrated ({_ORDER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            converted,
+        )
+        conn.execute("DROP TABLE orders")
+        conn.execute("ALTER TABLE orders_migrated RENAME TO orders")
+        for statement in _ORDERS_INDEXES_SQL.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
 
 
 class Database:
     """High-level database operations with thread-safe access."""
 
-    def __init__(self, db_path: str = DEFAULT_DB_PATH) -> None:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, order_commit_batch: int = 1) -> None:
         self.db_path = db_path
+        # Number of saved orders to accumulate before committing (1 = commit every order).
+        # Every commit on the connection also commits pending orders, so any other
+        # committing write (log_action, update_order_status, ...) restarts the count
+        self.order_commit_batch = max(1, order_commit_batch)
+        self._pending_orders = 0
         self._lock = threading.Lock()
-        self.conn = connect(db_path)
-        init_schema(self.conn)
+        self._connect_lock = threading.Lock()
+        # Opened lazily so engines that never touch storage skip connect + schema setup
+        self._conn: sqlite3.Connection | None = None
+        self._closed = False
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the connection, opening it and initializing the schema on first use.
+
+        Raises sqlite3.ProgrammingError once the database has been closed.
+        """
+        if self._conn is None:
+            with self._connect_lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+                if self._conn is None:
+                    conn = connect(self.db_path)
+                    init_schema(conn)
+                    self._conn = conn
+        return self._conn
+
+    def _commit(self) -> None:
+        self.conn.commit()
+        self._pending_orders = 0
+
+    def flush(self) -> None:
+        """Commit any writes still pending from batched order saves."""
+        if self._conn is not None and not self._closed:
+            self._commit()
 
     def close(self) -> None:
-        with self._lock:
-            self.conn.close()
+        with self._lock, self._connect_lock:
+            if self._conn is not None and not self._closed:
+                self._conn.commit()
+            self._closed = True
+            self._pending_orders = 0
+            if self._conn is not None:
+                self._conn.close()
 
     # Risk State Operations
     def get_trading_enabled(self) -> bool:
@@ -148,7 +266,7 @@ class Database:
             "UPDATE risk_state SET trading_enabled = ?, updated_at = ? WHERE id = 1",
             (enabled, now),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_paper_mode(self) -> bool:
         cursor = self.conn.execute(
@@ -163,24 +281,36 @@ class Database:
             "UPDATE risk_state SET paper_mode = ?, updated_at = ? WHERE id = 1",
             (paper, now),
         )
-        self.conn.commit()
+        self._commit()
 
     # Idempotency Operations
     def check_idempotency_key(self, key: str) -> bool:
         """Check if idempotency key exists and is not expired."""
         now = datetime.now(UTC).isoformat()
-        # Clean up expired keys first
-        self.conn.execute(
-            "DELETE FROM idempotency_keys WHERE expires_at < ?", (now,)
-        )
         cursor = self.conn.execute(
             "SELECT 1 FROM idempotency_keys WHERE key = ? AND expires_at >= ?",
             (key, now),
         )
         return cursor.fetchone() is not None
 
-    def add_idempotency_key(self, key: str, ttl_hours: int = 24) -> None:
-        """Add idempotency key with TTL."""
+    def purge_expired_idempotency_keys(self) -> int:
+        """Delete expired idempotency keys and return how many were removed.
+
+        Lookups already ignore expired keys, so this is periodic housekeeping only.
+        """
+        now = datetime.now(UTC).isoformat()
+        with self._lock:
+            cursor = self.conn.execute(
+                "DELETE FROM idempotency_keys WHERE expires_at < ?", (now,)
+            )
+            self._commit()
+        return cursor.rowcount
+
+    def add_idempotency_key(self, key: str, ttl_hours: int = 24, commit: bool = True) -> None:
+        """Add idempotency key with TTL.
+
+        Pass commit=False when an order write follows, so both land in one transaction.
+        """
         now = datetime.now(UTC)
         expires = now + timedelta(hours=ttl_hours)
         with self._lock:
@@ -188,7 +318,25 @@ class Database:
                 "INSERT OR REPLACE INTO idempotency_keys (key, created_at, expires_at) VALUES (?, ?, ?)",
                 (key, now.isoformat(), expires.isoformat()),
             )
-            self.conn.commit()
+            if commit:
+                self._commit()
+
+    def claim_idempotency_key(self, key: str, ttl_hours: int = 24, commit: bool = True) -> bool:
+        """Atomically record an idempotency key; return False if a live key already exists.
+
+        Replaces a check_idempotency_key/add_idempotency_key pair with one statement.
+        An expired key is overwritten and counts as claimed.
+        """
+        now = datetime.now(UTC)
+        expires = now + timedelta(hours=ttl_hours)
+        with self._lock:
+            cursor = self.conn.execute(
+                _CLAIM_IDEMPOTENCY_SQL,
+                (key, now.isoformat(), expires.isoformat()),
+            )
+            if commit:
+                self._commit()
+        return cursor.rowcount > 0
 
     # Order Operations
     def save_order(
@@ -201,17 +349,19 @@ class Database:
         size: float,
         status: str,
         strategy: str | None = None,
+        created_at: datetime | None = None,
     ) -> None:
-        now = datetime.now(UTC).isoformat()
+        # A new row's updated_at is its creation time, so the clock is read once for both
+        now_dt = created_at or datetime.now(UTC)
+        now = now_dt.isoformat()
+        created_ns = to_epoch_ns(now_dt)
         self.conn.execute(
-            """
-            INSERT OR REPLACE INTO orders
-            (order_id, market_id, outcome_id, side, price, size, status, strategy, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (order_id, market_id, outcome_id, side, price, size, status, strategy, now, now),
+            _SAVE_ORDER_SQL,
+            (order_id, market_id, outcome_id, side, price, size, status, strategy, created_ns, now),
         )
-        self.conn.commit()
+        self._pending_orders += 1
+        if self._pending_orders >= self.order_commit_batch:
+            self.flush()
 
     def update_order_status(self, order_id: str, status: str) -> None:
         now = datetime.now(UTC).isoformat()
@@ -219,13 +369,15 @@ class Database:
             "UPDATE orders SET status = ?, updated_at = ? WHERE order_id = ?",
             (status, now, order_id),
         )
-        self.conn.commit()
+        self._commit()
 
-    def get_open_orders(self) -> list[dict]:
-        cursor = self.conn.execute(
-            "SELECT * FROM orders WHERE status IN ('submitted', 'pending', 'paper')"
-        )
-        return [dict(row) for row in cursor.fetchall()]
+    def get_open_orders(self) -> list[sqlite3.Row]:
+        """Return open order rows; rows support key access like order["market_id"]."""
+        return self.conn.execute(_OPEN_ORDERS_SQL).fetchall()
+
+    def iter_open_orders(self) -> Iterator[sqlite3.Row]:
+        """Yield open order rows one at a time without materializing the result set."""
+        yield from self.conn.execute(_OPEN_ORDERS_SQL)
 
     def count_open_positions(self) -> int:
         cursor = self.conn.execute(
@@ -241,7 +393,12 @@ class Database:
         action: str,
         details: str | None = None,
         correlation_id: str | None = None,
+        commit: bool = True,
     ) -> None:
+        """Append an audit entry.
+
+        Pass commit=False when a state write follows, so both land in one transaction.
+        """
         self.conn.execute(
             """
             INSERT INTO audit_log (actor_id, action, details, correlation_id)
@@ -249,7 +406,8 @@ class Database:
             """,
             (actor_id, action, details, correlation_id),
         )
-        self.conn.commit()
+        if commit:
+            self._commit()
 
     # Strategy State Operations
     def get_strategy_enabled(self, strategy_name: str) -> bool:
@@ -269,7 +427,7 @@ class Database:
             """,
             (strategy_name, enabled, now),
         )
-        self.conn.commit()
+        self._commit()
 
     # Watchlist Operations
     def get_watchlist(self) -> set[str]:
@@ -282,13 +440,13 @@ class Database:
             "INSERT OR IGNORE INTO watchlist (market_id, added_at) VALUES (?, ?)",
             (market_id, now),
         )
-        self.conn.commit()
+        self._commit()
 
     def remove_from_watchlist(self, market_id: str) -> None:
         self.conn.execute(
             "DELETE FROM watchlist WHERE market_id = ?", (market_id,)
         )
-        self.conn.commit()
+        self._commit()
 
     # Daily PnL Operations
     def get_daily_pnl(self, date: str | None = None) -> float:
@@ -302,8 +460,9 @@ class Database:
         return row["total"] if row else 0.0
 
     def update_daily_pnl(self, realized: float = 0.0, unrealized: float = 0.0) -> None:
-        date = datetime.now(UTC).strftime("%Y-%m-%d")
-        now = datetime.now(UTC).isoformat()
+        now_dt = datetime.now(UTC)
+        date = now_dt.strftime("%Y-%m-%d")
+        now = now_dt.isoformat()
         self.conn.execute(
             """
             INSERT INTO daily_pnl (date, realized_pnl, unrealized_pnl, updated_at)
@@ -315,4 +474,4 @@ class Database:
             """,
             (date, realized, unrealized, now),
         )
-        self.conn.commit()
+        self._commit()
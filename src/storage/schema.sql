@@ -16,5 +16,5 @@ CREATE TABLE IF NOT EXISTS orders (
   price REAL NOT NULL,
   size REAL NOT NULL,
   status TEXT NOT NULL,
-  created_at TEXT NOT NULL
+  created_at INTEGER NOT NULL -- epoch nanoseconds
 );
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 
 @dataclass
 class TelegramAuth:
-    admin_ids: set[int]
+    admin_ids: frozenset[int] | set[int]
 
     def is_admin(self, user_id: int) -> bool:
         return user_id in self.admin_ids
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from execution.engine import ExecutionEngine
 from risk.engine import RiskEngine
 from signals.engine import SignalEngine
 from telegram.auth import TelegramAuth
@@ -13,6 +14,7 @@ class TelegramBot:
     auth: TelegramAuth
     risk: RiskEngine
     signals: SignalEngine
+    execution: ExecutionEngine | None = None
 
     def __post_init__(self) -> None:
         self.handler = CommandHandler(self.auth, self.risk, self.signals)
@@ -20,3 +22,8 @@ class TelegramBot:
     def handle_message(self, user_id: int, text: str) -> str:
         response = self.handler.handle(user_id, text)
         return response.text
+
+    def close(self) -> None:
+        """Shut down: commit any batched order writes and close storage."""
+        if self.execution is not None:
+            self.execution.close()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -19,12 +20,37 @@ from telegram.validation import (
 if TYPE_CHECKING:
     from storage.db import Database
 
+# Verb plus at most three arguments (/risk set <param> <value>), plus the unread remainder
+_MAX_COMMAND_SPLITS = 4
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class CommandResponse:
     text: str
 
 
+# Fixed replies are built once; responses are immutable, so sharing them is safe
+_UNKNOWN_RESPONSE = CommandResponse(text="unknown command. Use /help for available commands.")
+_RATE_LIMITED_RESPONSE = CommandResponse(text="Rate limit exceeded. Please wait.")
+_UNAUTHORIZED_RESPONSE = CommandResponse(text="unauthorized")
+_MARKETS_RESPONSE = CommandResponse(text="markets: demo-market")
+_WALLETS_RESPONSE = CommandResponse(text="wallets top: not yet wired")
+_HELP_RESPONSE = CommandResponse(
+    text=(
+        "Available commands:\n"
+        "/status - Show system status\n"
+        "/signals - Show active signals\n"
+        "/orders - Show open orders\n"
+        "/markets - Show available markets\n"
+        "/trade on|off - Enable/disable trading (admin)\n"
+        "/paper on|off - Enable/disable paper mode (admin)\n"
+        "/strategy enable|disable <name> - Toggle strategy (admin)\n"
+        "/watchlist add|remove <market_id> - Manage watchlist (admin)\n"
+        "/risk set <param> <value> - Set risk parameter (admin)"
+    )
+)
+
+
 class CommandHandler:
     def __init__(
         self,
@@ -43,6 +69,21 @@ class CommandHandler:
         self.watchlist: set[str] = set()
         self.rate_limiter = RateLimiter(max_requests=30, window_seconds=60)
 
+        # Exact verb -> handler; every handler takes (user_id, command tokens)
+        self._dispatch: dict[str, Callable[[int, list[str]], CommandResponse]] = {
+            "/trade": self._toggle_trade,
+            "/paper": self._toggle_paper,
+            "/strategy": self._toggle_strategy,
+            "/markets": self._get_markets,
+            "/watchlist": self._handle_watchlist,
+            "/risk": self._handle_risk,
+            "/orders": self._get_orders,
+            "/wallets": self._get_wallets,
+            "/signals": self._get_signals,
+            "/status": self._get_status,
+            "/help": self._get_help,
+        }
+
         # Load persisted state if database available
         if self.db:
             self._load_persisted_state()
@@ -56,47 +97,44 @@ class CommandHandler:
         self.watchlist = self.db.get_watchlist()
 
     def handle(self, user_id: int, command: str) -> CommandResponse:
+        # Split once; handlers index into the same token list. No handler reads past
+        # parts[3], so cap the split and leave any long tail as a single token.
+        parts = command.split(maxsplit=_MAX_COMMAND_SPLITS)
+        # Telegram appends "@botname" to commands addressed to a bot in group chats
+        verb = parts[0].partition("@")[0] if parts else ""
+        handler = self._dispatch.get(verb)
+        # Reject unknown verbs before any rate-limit bookkeeping or log sanitizing
+        if handler is None:
+            return _UNKNOWN_RESPONSE
+
         # Rate limiting check
         if not self.rate_limiter.is_allowed(user_id):
             self.logger.warning(
                 "rate_limit_exceeded",
                 extra={"user_id": user_id},
             )
-            return CommandResponse(text="Rate limit exceeded. Please wait.")
+            return _RATE_LIMITED_RESPONSE
 
-        # Sanitize command for logging
-        safe_command = sanitize_log_message(command)
-        self.logger.info(
-            "telegram_command_received",
-            extra={"user_id": user_id, "command": safe_command},
-        )
+        # Sanitizing is the costliest step here, so skip it when INFO is filtered out
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "telegram_command_received",
+                extra={"user_id": user_id, "command": sanitize_log_message(command)},
+            )
+
+        return handler(user_id, parts)
 
-        if command.startswith("/trade"):
-            return self._toggle_trade(user_id, command)
-        if command.startswith("/paper"):
-            return self._toggle_paper(user_id, command)
-        if command.startswith("/strategy"):
-            return self._toggle_strategy(user_id, command)
-        if command.startswith("/markets"):
-            return CommandResponse(text="markets: demo-market")
-        if command.startswith("/watchlist"):
-            return self._handle_watchlist(user_id, command)
-        if command.startswith("/risk"):
-            return self._handle_risk(user_id, command)
-        if command.startswith("/orders"):
-            return self._get_orders()
-        if command.startswith("/wallets"):
-            return CommandResponse(text="wallets top: not yet wired")
-        if command.startswith("/signals"):
-            batch = self.signals.evaluate()
-            return CommandResponse(text=f"signals: {len(batch.signals)} active")
-        if command.startswith("/status"):
-            return self._get_status()
-        if command.startswith("/help"):
-            return self._get_help()
-        return CommandResponse(text="unknown command. Use /help for available commands.")
-
-    def _get_status(self) -> CommandResponse:
+    def _get_markets(self, user_id: int, parts: list[str]) -> CommandResponse:
+        return _MARKETS_RESPONSE
+
+    def _get_wallets(self, user_id: int, parts: list[str]) -> CommandResponse:
+        return _WALLETS_RESPONSE
+
+    def _get_signals(self, user_id: int, parts: list[str]) -> CommandResponse:
+        batch = self.signals.evaluate()
+        return CommandResponse(text=f"signals: {len(batch.signals)} active")
+
+    def _get_status(self, user_id: int, parts: list[str]) -> CommandResponse:
         """Get current system status."""
         status = "on" if self.risk.trading_enabled else "off"
         paper_status = "on" if self.paper else "off"
@@ -107,7 +145,7 @@ class CommandHandler:
             f"positions {open_positions}, daily_pnl ${daily_pnl:.2f}"
         )
 
-    def _get_orders(self) -> CommandResponse:
+    def _get_orders(self, user_id: int, parts: list[str]) -> CommandResponse:
         """Get open orders."""
         if not self.db:
             return CommandResponse(text="orders: no open orders")
@@ -117,84 +155,72 @@ class CommandHandler:
         order_lines = [f"  {o['order_id']}: {o['side']} {o['size']}@{o['price']}" for o in orders[:5]]
         return CommandResponse(text=f"orders ({len(orders)} open):\n" + "\n".join(order_lines))
 
-    def _get_help(self) -> CommandResponse:
+    def _get_help(self, user_id: int, parts: list[str]) -> CommandResponse:
         """Get help message."""
-        return CommandResponse(
-            text=(
-                "Available commands:\n"
-                "/status - Show system status\n"
-                "/signals - Show active signals\n"
-                "/orders - Show open orders\n"
-                "/markets - Show available markets\n"
-                "/trade on|off - Enable/disable trading (admin)\n"
-                "/paper on|off - Enable/disable paper mode (admin)\n"
-                "/strategy enable|disable <name> - Toggle strategy (admin)\n"
-                "/watchlist add|remove <market_id> - Manage watchlist (admin)\n"
-                "/risk set <param> <value> - Set risk parameter (admin)"
-            )
-        )
+        return _HELP_RESPONSE
 
-    def _toggle_trade(self, user_id: int, command: str) -> CommandResponse:
+    def _toggle_trade(self, user_id: int, parts: list[str]) -> CommandResponse:
         if not self.auth.is_admin(user_id):
             self.logger.warning(
                 "telegram_command_denied",
                 extra={"user_id": user_id, "command": "trade"},
             )
-            return CommandResponse(text="unauthorized")
+            return _UNAUTHORIZED_RESPONSE
 
-        enabled = self._parse_toggle(command)
+        enabled = self._parse_toggle(parts)
         if enabled is None:
             return CommandResponse(text="usage: /trade on|off")
 
         self.risk.set_trading(enabled)
 
-        # Persist to database
+        # Persist to database; the audit row commits with the state change
         if self.db:
-            self.db.set_trading_enabled(enabled)
             self.db.log_action(
                 actor_id=str(user_id),
                 action="trade_toggle",
                 details=f"enabled={enabled}",
+                commit=False,
             )
+            self.db.set_trading_enabled(enabled)
 
         self.logger.info("trade_toggle", extra={"user_id": user_id, "enabled": enabled})
         return CommandResponse(text=f"trade {'on' if enabled else 'off'}")
 
-    def _toggle_paper(self, user_id: int, command: str) -> CommandResponse:
+    def _toggle_paper(self, user_id: int, parts: list[str]) -> CommandResponse:
         if not self.auth.is_admin(user_id):
             self.logger.warning(
                 "telegram_command_denied",
                 extra={"user_id": user_id, "command": "paper"},
             )
-            return CommandResponse(text="unauthorized")
+            return _UNAUTHORIZED_RESPONSE
 
-        enabled = self._parse_toggle(command)
+        enabled = self._parse_toggle(parts)
         if enabled is None:
             return CommandResponse(text="usage: /paper on|off")
 
         self.paper = enabled
 
-        # Persist to database
+        # Persist to database; the audit row commits with the state change
         if self.db:
-            self.db.set_paper_mode(enabled)
             self.db.log_action(
                 actor_id=str(user_id),
                 action="paper_toggle",
                 details=f"enabled={enabled}",
+                commit=False,
             )
+            self.db.set_paper_mode(enabled)
 
         self.logger.info("paper_toggle", extra={"user_id": user_id, "enabled": self.paper})
         return CommandResponse(text=f"paper {'on' if self.paper else 'off'}")
 
-    def _toggle_strategy(self, user_id: int, command: str) -> CommandResponse:
+    def _toggle_strategy(self, user_id: int, parts: list[str]) -> CommandResponse:
         if not self.auth.is_admin(user_id):
             self.logger.warning(
                 "telegram_command_denied",
                 extra={"user_id": user_id, "command": "strategy"},
             )
-            return CommandResponse(text="unauthorized")
+            return _UNAUTHORIZED_RESPONSE
 
-        parts = command.split()
         if len(parts) < 3:
             return CommandResponse(text="usage: /strategy enable|disable <name>")
 
@@ -209,14 +235,15 @@ class CommandHandler:
         enabled = action == "enable"
         self.strategy_state[name] = enabled
 
-        # Persist to database
+        # Persist to database; the audit row commits with the state change
         if self.db:
-            self.db.set_strategy_enabled(name, enabled)
             self.db.log_action(
                 actor_id=str(user_id),
                 action="strategy_toggle",
                 details=f"strategy={name}, enabled={enabled}",
+                commit=False,
             )
+            self.db.set_strategy_enabled(name, enabled)
 
         self.logger.info(
             "strategy_toggle",
@@ -224,15 +251,14 @@ class CommandHandler:
         )
         return CommandResponse(text=f"strategy {name} {'enabled' if enabled else 'disabled'}")
 
-    def _handle_watchlist(self, user_id: int, command: str) -> CommandResponse:
+    def _handle_watchlist(self, user_id: int, parts: list[str]) -> CommandResponse:
         if not self.auth.is_admin(user_id):
             self.logger.warning(
                 "telegram_command_denied",
                 extra={"user_id": user_id, "command": "watchlist"},
             )
-            return CommandResponse(text="unauthorized")
+            return _UNAUTHORIZED_RESPONSE
 
-        parts = command.split()
         if len(parts) < 3:
             return CommandResponse(text="usage: /watchlist add|remove <market_id>")
 
@@ -242,39 +268,41 @@ class CommandHandler:
         if not validate_market_id(market_id):
             return CommandResponse(text="Invalid market ID")
 
-        if action == "add":
-            self.watchlist.add(market_id)
-            if self.db:
-                self.db.add_to_watchlist(market_id)
-        elif action == "remove":
-            self.watchlist.discard(market_id)
-            if self.db:
-                self.db.remove_from_watchlist(market_id)
-        else:
+        if action not in {"add", "remove"}:
             return CommandResponse(text="usage: /watchlist add|remove <market_id>")
 
+        # The audit row commits with the watchlist write
         if self.db:
             self.db.log_action(
                 actor_id=str(user_id),
                 action="watchlist_update",
                 details=f"action={action}, market_id={market_id}",
+                commit=False,
             )
 
+        if action == "add":
+            self.watchlist.add(market_id)
+            if self.db:
+                self.db.add_to_watchlist(market_id)
+        else:
+            self.watchlist.discard(market_id)
+            if self.db:
+                self.db.remove_from_watchlist(market_id)
+
         self.logger.info(
             "watchlist_update",
             extra={"user_id": user_id, "action": action, "market_id": market_id},
         )
         return CommandResponse(text=f"watchlist {action} {market_id}")
 
-    def _handle_risk(self, user_id: int, command: str) -> CommandResponse:
+    def _handle_risk(self, user_id: int, parts: list[str]) -> CommandResponse:
         if not self.auth.is_admin(user_id):
             self.logger.warning(
                 "telegram_command_denied",
                 extra={"user_id": user_id, "command": "risk"},
             )
-            return CommandResponse(text="unauthorized")
+            return _UNAUTHORIZED_RESPONSE
 
-        parts = command.split()
         if len(parts) < 4 or parts[1] != "set":
             return CommandResponse(text="usage: /risk set <param> <value>")
 
@@ -307,8 +335,7 @@ class CommandHandler:
         return CommandResponse(text=f"risk {param} set to {value}")
 
     @staticmethod
-    def _parse_toggle(command: str) -> bool | None:
-        parts = command.split()
+    def _parse_toggle(parts: list[str]) -> bool | None:
         if len(parts) != 2:
             return None
         value = parts[1].lower()
@@ -1,67 +1,73 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from time import time
+from collections import OrderedDict, deque
+from time import monotonic
 
 # Maximum number of users to track before cleanup
 MAX_TRACKED_USERS = 10000
-# Cleanup interval (every N requests, perform cleanup)
-CLEANUP_INTERVAL = 100
 
 
 class RateLimiter:
     """Simple in-memory rate limiter using sliding window with automatic cleanup."""
 
+    __slots__ = ("max_requests", "window", "requests")
+
     def __init__(self, max_requests: int = 10, window_seconds: int = 60) -> None:
         self.max_requests = max_requests
         self.window = window_seconds
-        self.requests: dict[int, list[float]] = defaultdict(list)
-        self._request_count = 0
-
-    def _cleanup_stale_users(self) -> None:
-        """Remove users with no recent activity to prevent memory growth."""
-        now = time()
-        stale_users = [
-            user_id
-            for user_id, timestamps in self.requests.items()
-            if not timestamps or (now - max(timestamps)) > self.window * 2
-        ]
-        for user_id in stale_users:
-            del self.requests[user_id]
+        # Per-user request times, oldest first; users ordered by their latest request
+        self.requests: OrderedDict[int, deque[float]] = OrderedDict()
 
-    def is_allowed(self, user_id: int) -> bool:
-        """Check if user is allowed to make a request."""
-        now = time()
+    def _cleanup_stale_users(self, now: float) -> None:
+        """Remove users with no recent activity to prevent memory growth.
 
-        # Periodic cleanup to prevent memory leaks
-        self._request_count += 1
-        if self._request_count >= CLEANUP_INTERVAL:
-            self._cleanup_stale_users()
-            self._request_count = 0
+        Users are kept in order of last request, so only the stale prefix is visited.
+        """
+        while self.requests:
+            timestamps = next(iter(self.requests.values()))
+            if timestamps and (now - timestamps[-1]) <= self.window * 2:
+                break
+            self.requests.popitem(last=False)
 
-        # Clean old requests for this user
-        self.requests[user_id] = [
-            t for t in self.requests[user_id] if now - t < self.window
-        ]
+    def is_allowed(self, user_id: int, now: float | None = None) -> bool:
+        """Check if user is allowed to make a request.
 
-        if len(self.requests[user_id]) >= self.max_requests:
+        Args:
+            user_id: Telegram user making the request
+            now: time.monotonic() reading to use, if the caller already has one
+        """
+        if now is None:
+            now = monotonic()
+        self._cleanup_stale_users(now)
+
+        timestamps = self.requests.get(user_id)
+        if timestamps is None:
+            timestamps = self.requests[user_id] = deque()
+        self._expire(timestamps, now)
+        if len(timestamps) >= self.max_requests:
             return False
 
-        self.requests[user_id].append(now)
+        timestamps.append(now)
+        self.requests.move_to_end(user_id)
         return True
 
+    def _expire(self, timestamps: deque[float], now: float) -> None:
+        """Drop request times that have left the window (they are kept in time order)."""
+        while timestamps and now - timestamps[0] >= self.window:
+            timestamps.popleft()
+
     def reset(self, user_id: int) -> None:
         """Reset rate limit for a specific user."""
         if user_id in self.requests:
             del self.requests[user_id]
 
-    def remaining(self, user_id: int) -> int:
+    def remaining(self, user_id: int, now: float | None = None) -> int:
         """Get remaining requests for a user."""
-        now = time()
-        self.requests[user_id] = [
-            t for t in self.requests[user_id] if now - t < self.window
-        ]
-        return max(0, self.max_requests - len(self.requests[user_id]))
+        timestamps = self.requests.get(user_id)
+        if timestamps is None:
+            return self.max_requests
+        self._expire(timestamps, monotonic() if now is None else now)
+        return max(0, self.max_requests - len(timestamps))
 
     def active_users(self) -> int:
         """Get count of currently tracked users (for monitoring)."""
@@ -1,26 +1,51 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
-# Validation patterns
-SAFE_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{1,64}$")
-SAFE_MARKET_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{1,128}$")
-SAFE_PARAM_PATTERN = re.compile(r"^[a-zA-Z0-9_.]{1,64}$")
+# Validation patterns (applied with fullmatch; "$" alone would also accept a trailing newline)
+SAFE_NAME_PATTERN = re.compile(r"[a-zA-Z0-9_-]{1,64}")
+SAFE_MARKET_ID_PATTERN = re.compile(r"[a-zA-Z0-9_-]{1,128}")
+SAFE_PARAM_PATTERN = re.compile(r"[a-zA-Z0-9_.]{1,64}")
 
+# Stand-in for characters that are neither printable nor whitespace
+_REPLACEMENT = ord("?")
+# Upper bound on remembered code points; each user message can only add a handful
+_MAX_CACHED_CODEPOINTS = 4096
 
+
+class _SanitizeTable(dict[int, int]):
+    """str.translate() table that classifies each code point once and remembers it."""
+
+    def __missing__(self, codepoint: int) -> int:
+        char = chr(codepoint)
+        result = codepoint if char.isprintable() or char.isspace() else _REPLACEMENT
+        if len(self) < _MAX_CACHED_CODEPOINTS:
+            self[codepoint] = result
+        return result
+
+
+_SANITIZE_TABLE = _SanitizeTable()
+
+
+# The name/id validators are pure and see the same few values on every admin command.
+# Telegram caps messages at 4096 chars, which bounds what the caches can hold.
+@lru_cache(maxsize=1024)
 def validate_strategy_name(name: str) -> bool:
     """Validate a strategy name is safe."""
-    return bool(SAFE_NAME_PATTERN.match(name))
+    return bool(SAFE_NAME_PATTERN.fullmatch(name))
 
 
+@lru_cache(maxsize=1024)
 def validate_market_id(market_id: str) -> bool:
     """Validate a market ID is safe."""
-    return bool(SAFE_MARKET_ID_PATTERN.match(market_id))
+    return bool(SAFE_MARKET_ID_PATTERN.fullmatch(market_id))
 
 
+@lru_cache(maxsize=1024)
 def validate_param_name(param: str) -> bool:
     """Validate a parameter name is safe."""
-    return bool(SAFE_PARAM_PATTERN.match(param))
+    return bool(SAFE_PARAM_PATTERN.fullmatch(param))
 
 
 def validate_numeric_value(value: str, min_val: float = 0.0, max_val: float = 1e9) -> float | None:
@@ -36,9 +61,8 @@ def validate_numeric_value(value: str, min_val: float = 0.0, max_val: float = 1e
 
 def sanitize_log_message(message: str, max_length: int = 500) -> str:
     """Sanitize a message for logging (remove sensitive chars, truncate)."""
+    # Truncate first so oversized input costs no more than max_length characters of work
+    if len(message) > max_length:
+        return message[:max_length].translate(_SANITIZE_TABLE) + "..."
     # Remove control characters
-    sanitized = "".join(c if c.isprintable() or c.isspace() else "?" for c in message)
-    # Truncate if too long
-    if len(sanitized) > max_length:
-        sanitized = sanitized[:max_length] + "..."
-    return sanitized
+    return message.translate(_SANITIZE_TABLE)
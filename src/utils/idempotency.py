@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class IdempotencyStore:
     keys: set[str] = field(default_factory=set)
 
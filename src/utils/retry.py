@@ -1,15 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import random
+import sys
+import threading
 import time
-from collections.abc import Callable
-from typing import TypeVar
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Literal, TypeVar
 
 T = TypeVar("T")
 
+JitterMode = Literal["none", "half", "full", "decorrelated"]
+
 logger = logging.getLogger(__name__)
 
+# Per-thread RNGs so concurrent retries don't share the global random state
+_tls = threading.local()
+
+
+def _rng() -> random.Random:
+    rng: random.Random | None = getattr(_tls, "rng", None)
+    if rng is None:
+        rng = random.Random()
+        _tls.rng = rng
+    return rng
+
 
 class RetryError(Exception):
     """Raised when all retry attempts fail."""
@@ -20,6 +37,164 @@ class RetryError(Exception):
         self.last_error = last_error
 
 
+class RetryBudget:
+    """Token bucket shared across retry() calls to cap aggregate retries against a dependency.
+
+    Each retry spends one token; tokens refill continuously up to `capacity`. When the
+    bucket is empty, retry() re-raises the failure instead of backing off again.
+    """
+
+    __slots__ = ("capacity", "refill_per_s", "_tokens", "_updated", "_lock")
+
+    def __init__(self, capacity: float, refill_per_s: float) -> None:
+        self.capacity = capacity
+        self.refill_per_s = refill_per_s
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_consume(self, now: float | None = None) -> bool:
+        """Spend one token if available.
+
+        Args:
+            now: time.monotonic() reading to use, if the caller already has one
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_s)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+@lru_cache(maxsize=64)
+def _backoff_schedule(base_delay_s: float, max_delay_s: float, exponential: bool) -> tuple[float, ...]:
+    """Un-jittered delays per attempt, stopping once they saturate; reuse the last entry after."""
+    if not exponential:
+        return (base_delay_s,)
+    delays = []
+    for attempt in range(63):
+        delay = min(base_delay_s * (1 << attempt), max_delay_s)
+        delays.append(delay)
+        if delay >= max_delay_s:
+            break
+    return tuple(delays)
+
+
+# Jitter functions take (delay, base_delay_s, max_delay_s, prev_delay); one is picked per call
+JitterFn = Callable[[float, float, float, float], float]
+
+
+def _no_jitter(delay: float, base_delay_s: float, max_delay_s: float, prev_delay: float) -> float:
+    return delay
+
+
+def _half_jitter(delay: float, base_delay_s: float, max_delay_s: float, prev_delay: float) -> float:
+    """Scale the delay by 0.5x-1.5x."""
+    return delay * (0.5 + _rng().random())
+
+
+def _full_jitter(delay: float, base_delay_s: float, max_delay_s: float, prev_delay: float) -> float:
+    """Draw uniformly from [0, delay]."""
+    return _rng().uniform(0, delay)
+
+
+def _decorrelated_jitter(
+    delay: float, base_delay_s: float, max_delay_s: float, prev_delay: float
+) -> float:
+    """Draw from [base, 3 * prev_delay], capped at max_delay_s."""
+    return min(max_delay_s, _rng().uniform(base_delay_s, prev_delay * 3))
+
+
+_JITTER_FNS: dict[str, JitterFn] = {
+    "none": _no_jitter,
+    "half": _half_jitter,
+    "full": _full_jitter,
+    "decorrelated": _decorrelated_jitter,
+}
+
+
+class _Backoff:
+    """Per-call backoff state shared by retry() and retry_async()."""
+
+    __slots__ = (
+        "base_delay_s",
+        "max_delay_s",
+        "jitter_fn",
+        "schedule",
+        "deadline_s",
+        "start_time",
+        "prev_delay",
+        "delays",
+        "last_step",
+    )
+
+    def __init__(
+        self,
+        base_delay_s: float,
+        max_delay_s: float,
+        exponential: bool,
+        mode: JitterMode,
+        schedule: Callable[[int], float] | None,
+        deadline_s: float | None,
+    ) -> None:
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.jitter_fn = _JITTER_FNS[mode]
+        self.schedule = schedule
+        self.deadline_s = deadline_s
+        self.start_time = time.monotonic()
+        self.prev_delay = base_delay_s
+        self.delays = _backoff_schedule(base_delay_s, max_delay_s, exponential)
+        self.last_step = len(self.delays) - 1
+
+    def remaining(self) -> float | None:
+        """Seconds left before the deadline, or None when there is no deadline."""
+        if self.deadline_s is None:
+            return None
+        return self.deadline_s - (time.monotonic() - self.start_time)
+
+    def next_delay(self, attempt: int) -> float | None:
+        """Jittered delay before the next attempt, or None if the deadline has passed."""
+        if self.schedule is not None:
+            delay = self.schedule(attempt)
+        else:
+            delay = self.delays[attempt if attempt < self.last_step else self.last_step]
+
+        delay = self.jitter_fn(delay, self.base_delay_s, self.max_delay_s, self.prev_delay)
+        self.prev_delay = delay
+
+        remaining = self.remaining()
+        if remaining is None:
+            return delay
+        if remaining <= 0:
+            return None
+        return min(delay, remaining)
+
+    def timed_out(self, attempt: int, last_error: Exception) -> RetryError:
+        return RetryError(
+            f"Operation timed out after {self.deadline_s}s ({attempt + 1} attempts)",
+            attempts=attempt + 1,
+            last_error=last_error,
+        )
+
+
+def _log_retry(attempt: int, attempts: int, delay: float, exc: Exception) -> None:
+    logger.warning(
+        "retry_attempt",
+        extra={
+            "attempt": attempt + 1,
+            "max_attempts": attempts,
+            "delay_s": delay,
+            "error": str(exc),
+        },
+    )
+
+
 def retry(
     operation: Callable[[], T],
     attempts: int = 3,
@@ -28,6 +203,10 @@ def retry(
     exponential: bool = True,
     jitter: bool = True,
     retryable_exceptions: tuple[type[Exception], ...] | None = None,
+    jitter_mode: JitterMode | None = None,
+    deadline_s: float | None = None,
+    schedule: Callable[[int], float] | None = None,
+    budget: RetryBudget | None = None,
 ) -> T:
     """Retry an operation with configurable backoff.
 
@@ -39,14 +218,25 @@ def retry(
         exponential: Use exponential backoff if True, fixed delay if False
         jitter: Add random jitter to delays to prevent thundering herd
         retryable_exceptions: Tuple of exception types to retry on. If None, retry on all exceptions.
+        jitter_mode: "none", "half", "full" or "decorrelated". Overrides `jitter` when given;
+            otherwise `jitter=True` means "half" and `jitter=False` means "none".
+        deadline_s: Total time budget in seconds, measured with time.monotonic() and
+            including the time spent inside the operation. Sleeps never overrun it.
+        schedule: Optional function mapping the zero-based attempt to its un-jittered delay,
+            replacing the exponential/fixed schedule
+        budget: Optional RetryBudget shared between calls; when it is exhausted the
+            failure is re-raised immediately instead of being retried
 
     Returns:
         The result of the operation
 
     Raises:
-        RetryError: If all attempts fail
+        RetryError: If all attempts fail or the deadline is reached
     """
+    mode: JitterMode = jitter_mode or ("half" if jitter else "none")
+    backoff = _Backoff(base_delay_s, max_delay_s, exponential, mode, schedule, deadline_s)
     last_error: Exception | None = None
+    attempt = 0
 
     for attempt in range(attempts):
         try:
@@ -62,94 +252,225 @@ def retry(
             if is_last_attempt:
                 break
 
-            # Calculate delay with exponential backoff
-            if exponential:
-                delay = min(base_delay_s * (2**attempt), max_delay_s)
-            else:
-                delay = base_delay_s
-
-            # Add jitter (0.5x to 1.5x)
-            if jitter:
-                delay *= 0.5 + random.random()
-
-            logger.warning(
-                "retry_attempt",
-                extra={
-                    "attempt": attempt + 1,
-                    "max_attempts": attempts,
-                    "delay_s": delay,
-                    "error": str(exc),
-                },
-            )
+            if budget is not None and not budget.try_consume():
+                raise
 
+            delay = backoff.next_delay(attempt)
+            if delay is None:
+                raise backoff.timed_out(attempt, exc) from None
+
+            _log_retry(attempt, attempts, delay, exc)
             time.sleep(delay)
 
     raise RetryError(
-        f"Operation failed after {attempts} attempts",
-        attempts=attempts,
+        f"Operation failed after {attempt + 1} attempts",
+        attempts=attempt + 1,
         last_error=last_error,
     )
 
 
-def retry_with_timeout(
-    operation: Callable[[], T],
-    timeout_s: float,
+async def retry_async(
+    operation: Callable[[], Awaitable[T]],
+    attempts: int = 3,
     base_delay_s: float = 0.5,
-    max_delay_s: float = 5.0,
+    max_delay_s: float = 30.0,
+    exponential: bool = True,
+    jitter: bool = True,
+    retryable_exceptions: tuple[type[Exception], ...] | None = None,
+    jitter_mode: JitterMode | None = None,
+    deadline_s: float | None = None,
+    schedule: Callable[[int], float] | None = None,
+    budget: RetryBudget | None = None,
 ) -> T:
-    """Retry an operation until timeout.
+    """Async counterpart of retry(); backs off with asyncio.sleep so the event loop keeps running.
+
+    When `deadline_s` is set, each attempt is also bounded by the remaining budget via
+    asyncio.wait_for, so a hung operation cannot overrun it.
 
     Args:
         operation: The operation to retry
-        timeout_s: Total timeout in seconds
+        attempts: Maximum number of attempts
         base_delay_s: Initial delay between retries
         max_delay_s: Maximum delay between retries
+        exponential: Use exponential backoff if True, fixed delay if False
+        jitter: Add random jitter to delays to prevent thundering herd
+        retryable_exceptions: Tuple of exception types to retry on. If None, retry on all exceptions.
+        jitter_mode: "none", "half", "full" or "decorrelated". Overrides `jitter` when given;
+            otherwise `jitter=True` means "half" and `jitter=False` means "none".
+        deadline_s: Total time budget in seconds, measured with time.monotonic() and
+            including the time spent inside the operation. Sleeps never overrun it.
+        schedule: Optional function mapping the zero-based attempt to its un-jittered delay,
+            replacing the exponential/fixed schedule
+        budget: Optional RetryBudget shared between calls; when it is exhausted the
+            failure is re-raised immediately instead of being retried
 
     Returns:
         The result of the operation
 
     Raises:
-        RetryError: If timeout is reached
+        RetryError: If all attempts fail or the deadline is reached
     """
-    start_time = time.monotonic()
+    mode: JitterMode = jitter_mode or ("half" if jitter else "none")
+    backoff = _Backoff(base_delay_s, max_delay_s, exponential, mode, schedule, deadline_s)
     last_error: Exception | None = None
     attempt = 0
 
-    while time.monotonic() - start_time < timeout_s:
+    for attempt in range(attempts):
         try:
-            return operation()
+            remaining = backoff.remaining()
+            if remaining is None:
+                return await operation()
+            return await asyncio.wait_for(operation(), max(remaining, 0.0))
         except Exception as exc:
-            last_error = exc
-            attempt += 1
-
-            # Calculate remaining time
-            elapsed = time.monotonic() - start_time
-            remaining = timeout_s - elapsed
+            if retryable_exceptions is not None and not isinstance(exc, retryable_exceptions):
+                raise
 
-            if remaining <= 0:
+            last_error = exc
+            if attempt >= attempts - 1:
                 break
 
-            # Calculate delay with exponential backoff
-            delay = min(base_delay_s * (2 ** (attempt - 1)), max_delay_s, remaining)
-
-            # Add jitter
-            delay *= 0.5 + random.random()
-
-            logger.warning(
-                "retry_attempt_timeout",
-                extra={
-                    "attempt": attempt,
-                    "elapsed_s": elapsed,
-                    "remaining_s": remaining,
-                    "delay_s": delay,
-                    "error": str(exc),
-                },
-            )
+            if budget is not None and not budget.try_consume():
+                raise
+
+            delay = backoff.next_delay(attempt)
+            if delay is None:
+                raise backoff.timed_out(attempt, exc) from None
 
-            time.sleep(min(delay, remaining))
+            _log_retry(attempt, attempts, delay, exc)
+            await asyncio.sleep(delay)
 
     raise RetryError(
-        f"Operation timed out after {timeout_s}s ({attempt} attempts)",
-        attempts=attempt,
+        f"Operation failed after {attempt + 1} attempts",
+        attempts=attempt + 1,
         last_error=last_error,
     )
+
+
+def retry_predicate(
+    operation: Callable[[], T],
+    is_success: Callable[[T], bool],
+    attempts: int = 3,
+    base_delay_s: float = 0.5,
+    max_delay_s: float = 30.0,
+    exponential: bool = True,
+    jitter: bool = True,
+    jitter_mode: JitterMode | None = None,
+    deadline_s: float | None = None,
+    schedule: Callable[[int], float] | None = None,
+) -> T:
+    """Retry until `is_success` accepts the operation's return value.
+
+    For "not ready yet" polling this avoids raising and catching an exception on every
+    miss. Exceptions raised by the operation itself are not caught.
+
+    Args:
+        operation: The operation to retry
+        is_success: Predicate deciding whether a returned value ends the retries
+        attempts: Maximum number of attempts
+        base_delay_s: Initial delay between retries
+        max_delay_s: Maximum delay between retries
+        exponential: Use exponential backoff if True, fixed delay if False
+        jitter: Add random jitter to delays to prevent thundering herd
+        jitter_mode: "none", "half", "full" or "decorrelated"; overrides `jitter` when given
+        deadline_s: Total time budget in seconds, measured with time.monotonic()
+        schedule: Optional function mapping the zero-based attempt to its un-jittered delay
+
+    Returns:
+        The first value accepted by `is_success`
+
+    Raises:
+        RetryError: If no attempt succeeds or the deadline is reached
+    """
+    mode: JitterMode = jitter_mode or ("half" if jitter else "none")
+    backoff = _Backoff(base_delay_s, max_delay_s, exponential, mode, schedule, deadline_s)
+    attempt = 0
+
+    for attempt in range(attempts):
+        value = operation()
+        if is_success(value):
+            return value
+        if attempt >= attempts - 1:
+            break
+
+        delay = backoff.next_delay(attempt)
+        if delay is None:
+            raise RetryError(
+                f"Operation timed out after {deadline_s}s ({attempt + 1} attempts)",
+                attempts=attempt + 1,
+            )
+        time.sleep(delay)
+
+    raise RetryError(f"Operation failed after {attempt + 1} attempts", attempts=attempt + 1)
+
+
+def _no_time_left(timeout_s: float) -> RetryError:
+    # A non-positive timeout leaves no budget for even one attempt
+    return RetryError(f"Operation timed out after {timeout_s}s (0 attempts)", attempts=0)
+
+
+def retry_with_timeout(
+    operation: Callable[[], T],
+    timeout_s: float,
+    base_delay_s: float = 0.5,
+    max_delay_s: float = 5.0,
+    jitter_mode: JitterMode = "half",
+) -> T:
+    """Retry an operation until timeout; a thin wrapper over retry(deadline_s=...).
+
+    Args:
+        operation: The operation to retry
+        timeout_s: Total timeout in seconds
+        base_delay_s: Initial delay between retries
+        max_delay_s: Maximum delay between retries
+        jitter_mode: "none", "half", "full" or "decorrelated"
+
+    Returns:
+        The result of the operation
+
+    Raises:
+        RetryError: If timeout is reached
+    """
+    if timeout_s <= 0:
+        raise _no_time_left(timeout_s)
+    return retry(
+        operation,
+        attempts=sys.maxsize,
+        base_delay_s=base_delay_s,
+        max_delay_s=max_delay_s,
+        jitter_mode=jitter_mode,
+        deadline_s=timeout_s,
+    )
+
+
+async def retry_with_timeout_async(
+    operation: Callable[[], Awaitable[T]],
+    timeout_s: float,
+    base_delay_s: float = 0.5,
+    max_delay_s: float = 5.0,
+    jitter_mode: JitterMode = "half",
+) -> T:
+    """Async counterpart of retry_with_timeout(); attempts are cut off at the deadline.
+
+    Args:
+        operation: The operation to retry
+        timeout_s: Total timeout in seconds
+        base_delay_s: Initial delay between retries
+        max_delay_s: Maximum delay between retries
+        jitter_mode: "none", "half", "full" or "decorrelated"
+
+    Returns:
+        The result of the operation
+
+    Raises:
+        RetryError: If timeout is reached
+    """
+    if timeout_s <= 0:
+        raise _no_time_left(timeout_s)
+    return await retry_async(
+        operation,
+        attempts=sys.maxsize,
+        base_delay_s=base_delay_s,
+        max_delay_s=max_delay_s,
+        jitter_mode=jitter_mode,
+        deadline_s=timeout_s,
+    )
@@ -1,7 +1,37 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
 
 
 def utc_now() -> datetime:
     return datetime.now(UTC)
+
+
+def to_epoch_ns(value: datetime) -> int:
+    """Convert an aware datetime to integer nanoseconds since the Unix epoch (exact)."""
+    return (value - EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def from_epoch_ns(value: int) -> datetime:
+    """Convert integer nanoseconds since the Unix epoch to a UTC datetime (exact to the microsecond)."""
+    return EPOCH + timedelta(microseconds=value // 1000)
+
+
+def parse_stored_timestamp(value: int | str) -> datetime:
+    """Parse a stored timestamp: epoch nanoseconds (possibly as a digit string), or ISO text."""
+    if isinstance(value, int):
+        return from_epoch_ns(value)
+    if value.isdigit():
+        # Integers written into a TEXT-affinity column come back as digit strings
+        return from_epoch_ns(int(value))
+    return _parse_iso(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    # Legacy rows are re-read on every open-order listing; datetimes are immutable so sharing is safe
+    return datetime.fromisoformat(value)
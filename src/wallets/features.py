@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+# Feature fields in declaration order (the order as_dict() and scoring use)
+FEATURE_NAMES = ("roi", "win_rate", "drawdown_proxy", "timing_edge", "market_selectivity")
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class WalletFeatures:
     roi: float
     win_rate: float
@@ -11,11 +14,9 @@ class WalletFeatures:
     timing_edge: float
     market_selectivity: float
 
+    def as_tuple(self) -> tuple[float, float, float, float, float]:
+        """Feature values in FEATURE_NAMES order."""
+        return (self.roi, self.win_rate, self.drawdown_proxy, self.timing_edge, self.market_selectivity)
+
     def as_dict(self) -> dict[str, float]:
-        return {
-            "roi": self.roi,
-            "win_rate": self.win_rate,
-            "drawdown_proxy": self.drawdown_proxy,
-            "timing_edge": self.timing_edge,
-            "market_selectivity": self.market_selectivity,
-        }
+        return dict(zip(FEATURE_NAMES, self.as_tuple(), strict=True))
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import math
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import lru_cache
 
-from wallets.features import WalletFeatures
+from wallets.features import FEATURE_NAMES, WalletFeatures
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WalletScore:
     wallet: str
     score: float
     features: WalletFeatures
 
 
+@lru_cache(maxsize=32)
+def _compile_score(weights: tuple[float, ...]) -> Callable[[WalletFeatures], float]:
+    """Generate a straight-line weighted sum with the weights inlined as float literals."""
+    terms = " + ".join(
+        f"features.{name} * {weight!r}" for name, weight in zip(FEATURE_NAMES, weights, strict=True)
+    )
+    namespace: dict[str, object] = {}
+    exec(f"def score(features):\n    return {terms}\n", namespace)  # only finite float reprs are interpolated
+    return namespace["score"]  # type: ignore[return-value]
+
+
 class WalletScoringEngine:
     def __init__(self, weights: dict[str, float] | None = None) -> None:
         self.weights = weights or {
@@ -21,7 +35,15 @@ class WalletScoringEngine:
             "timing_edge": 0.2,
             "market_selectivity": 0.1,
         }
+        unknown = self.weights.keys() - set(FEATURE_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown wallet feature weights: {sorted(unknown)}")
+        # Weights aligned to FEATURE_NAMES (missing features weigh 0); weights stays for
+        # introspection, so mutating it later has no effect on scoring
+        self._w = tuple(float(self.weights.get(name, 0.0)) for name in FEATURE_NAMES)
+        if not all(math.isfinite(weight) for weight in self._w):
+            raise ValueError(f"Wallet feature weights must be finite: {self.weights}")
+        self._score_fn = _compile_score(self._w)
 
     def score(self, wallet: str, features: WalletFeatures) -> WalletScore:
-        total = sum(features.as_dict()[key] * weight for key, weight in self.weights.items())
-        return WalletScore(wallet=wallet, score=total, features=features)
+        return WalletScore(wallet=wallet, score=self._score_fn(features), features=features)
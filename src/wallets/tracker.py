@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import heapq
+import time
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import datetime
 
+from utils.time import from_epoch_ns
 from wallets.features import WalletFeatures
 from wallets.scoring import WalletScore, WalletScoringEngine
 
 
-@dataclass
+@dataclass(slots=True)
 class WalletSnapshot:
     wallet: str
     features: WalletFeatures
-    captured_at: datetime
+    # Epoch nanoseconds from time.time_ns(); ingest is hot, so no datetime is built up front
+    captured_at_ns: int
+
+    @property
+    def captured_at(self) -> datetime:
+        return from_epoch_ns(self.captured_at_ns)
 
 
 @dataclass
@@ -22,19 +30,47 @@ class WalletWatchlist:
         self.wallets[snapshot.wallet] = snapshot
 
     def top(self, scoring: WalletScoringEngine, limit: int = 10) -> list[WalletScore]:
-        scores = [scoring.score(wallet, snapshot.features) for wallet, snapshot in self.wallets.items()]
-        return sorted(scores, key=lambda item: item.score, reverse=True)[:limit]
+        scores = (scoring.score(wallet, snapshot.features) for wallet, snapshot in self.wallets.items())
+        # Bounded heap: O(n log limit) and only `limit` scores kept alive; ties keep insertion order
+        return heapq.nlargest(limit, scores, key=lambda item: item.score)
 
 
 class WalletTracker:
+    """Keeps the latest snapshot per wallet and a live leaderboard scored at ingest time."""
+
     def __init__(self, scoring: WalletScoringEngine | None = None) -> None:
         self.scoring = scoring or WalletScoringEngine()
         self.watchlist = WalletWatchlist()
+        self._scores: dict[str, WalletScore] = {}
+        # First-ingest position per wallet, so equal scores rank in ingest order
+        self._rank: dict[str, int] = {}
+        # Max-heap of (-score, rank, wallet); entries superseded by a newer ingest are
+        # skipped lazily, and _live holds the one current entry per wallet
+        self._heap: list[tuple[float, int, str]] = []
+        self._live: dict[str, tuple[float, int, str]] = {}
 
     def ingest(self, wallet: str, features: WalletFeatures) -> WalletSnapshot:
-        snapshot = WalletSnapshot(wallet=wallet, features=features, captured_at=datetime.now(UTC))
+        snapshot = WalletSnapshot(wallet=wallet, features=features, captured_at_ns=time.time_ns())
         self.watchlist.update(snapshot)
+
+        score = self.scoring.score(wallet, features)
+        self._scores[wallet] = score
+        rank = self._rank.setdefault(wallet, len(self._rank))
+        entry = (-score.score, rank, wallet)
+        self._live[wallet] = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._live) + 16:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
         return snapshot
 
     def leaderboard(self, limit: int = 10) -> list[WalletScore]:
-        return self.watchlist.top(self.scoring, limit=limit)
+        heap, live = self._heap, self._live
+        taken: list[tuple[float, int, str]] = []
+        while heap and len(taken) < limit:
+            entry = heapq.heappop(heap)
+            if live[entry[2]] is entry:
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [self._scores[wallet] for _, _, wallet in taken]
@@ -0,0 +1,31 @@
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from types import MappingProxyType
+from typing import Any
+
+import pytest
+
+from app.config import load_config
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Reset the memoized config so env changes made by a test are picked up."""
+    load_config.cache_clear()
+    yield
+    load_config.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def base_signal_kwargs() -> Mapping[str, Any]:
+    """Default Signal fields (minus confidence) with a fixed timestamp; read-only, so shareable."""
+    return MappingProxyType(
+        {
+            "strategy": "test_strategy",
+            "market_id": "test-market",
+            "outcome_id": "yes",
+            "action": "buy",
+            "explanation": {"test": "data"},
+            "created_at": datetime(2024, 1, 1, tzinfo=UTC),
+        }
+    )
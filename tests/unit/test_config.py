@@ -0,0 +1,54 @@
+import dataclasses
+
+import pytest
+
+from app.config import load_config, reload_config
+
+
+class TestLoadConfig:
+    def test_defaults(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("APP_ENV", raising=False)
+        monkeypatch.delenv("PAPER_TRADING", raising=False)
+        monkeypatch.delenv("TELEGRAM_ADMINS", raising=False)
+        config = load_config()
+        assert config.env == "local"
+        assert config.paper_trading is True
+        assert config.telegram_admins == frozenset()
+
+    def test_parses_admins(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TELEGRAM_ADMINS", "1, 2,abc,3")
+        config = load_config()
+        assert config.telegram_admins == {1, 2, 3}
+
+    def test_ignores_partially_numeric_tokens(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TELEGRAM_ADMINS", "12a,4,b5, 7 ")
+        config = load_config()
+        assert config.telegram_admins == {4, 7}
+
+    def test_rejects_negative_ids(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TELEGRAM_ADMINS", "-100,5")
+        config = load_config()
+        assert config.telegram_admins == {5}
+
+    def test_result_is_cached(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("APP_ENV", "first")
+        first = load_config()
+        monkeypatch.setenv("APP_ENV", "second")
+        assert load_config() is first
+
+        load_config.cache_clear()
+        assert load_config().env == "second"
+
+    def test_reload_config_rereads_environment(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PAPER_TRADING", "true")
+        assert load_config().paper_trading is True
+        monkeypatch.setenv("PAPER_TRADING", "false")
+        reloaded = reload_config()
+        assert reloaded.paper_trading is False
+        assert load_config() is reloaded
+
+    def test_cached_config_is_immutable(self) -> None:
+        config = load_config()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.paper_trading = False  # type: ignore[misc]
+        assert isinstance(config.telegram_admins, frozenset)
@@ -1,8 +1,13 @@
 import os
+import sqlite3
 import tempfile
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
 
 import pytest
 
+import storage.db
+from execution.engine import ExecutionEngine
 from storage.db import Database
 
 
@@ -17,6 +22,52 @@ def temp_db():
     os.unlink(db_path)
 
 
+class TestDatabaseLazyConnection:
+    def test_no_connection_until_first_use(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "nested" / "lazy.db"
+        db = Database(str(db_path))
+        assert db._conn is None
+        assert not db_path.parent.exists()
+
+        assert db.get_trading_enabled() is False
+        assert db._conn is not None
+        assert db_path.exists()
+        db.close()
+
+    def test_schema_initialized_once(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls = 0
+        real_init_schema = storage.db.init_schema
+
+        def counting_init_schema(conn: sqlite3.Connection) -> None:
+            nonlocal calls
+            calls += 1
+            real_init_schema(conn)
+
+        monkeypatch.setattr(storage.db, "init_schema", counting_init_schema)
+        db = Database(str(tmp_path / "once.db"))
+        assert calls == 0
+        db.set_trading_enabled(True)
+        db.add_idempotency_key("key-1")
+        assert db.get_trading_enabled() is True
+        assert calls == 1
+        db.close()
+
+    def test_closed_database_raises(self, tmp_path: Path) -> None:
+        db = Database(str(tmp_path / "closed.db"))
+        db.get_paper_mode()
+        db.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.get_paper_mode()
+
+    def test_closed_before_use_does_not_open(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "never.db"
+        db = Database(str(db_path))
+        db.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.get_paper_mode()
+        assert not db_path.exists()
+
+
 class TestDatabaseRiskState:
     def test_trading_disabled_by_default(self, temp_db: Database) -> None:
         assert temp_db.get_trading_enabled() is False
@@ -49,6 +100,24 @@ class TestDatabaseIdempotency:
         assert temp_db.check_idempotency_key("key-1") is True
         assert temp_db.check_idempotency_key("key-2") is False
 
+    def test_claim_idempotency_key(self, temp_db: Database) -> None:
+        assert temp_db.claim_idempotency_key("claim-key") is True
+        assert temp_db.claim_idempotency_key("claim-key") is False
+        assert temp_db.check_idempotency_key("claim-key") is True
+
+    def test_claim_replaces_expired_key(self, temp_db: Database) -> None:
+        temp_db.add_idempotency_key("old-key", ttl_hours=-1)
+        assert temp_db.claim_idempotency_key("old-key") is True
+        assert temp_db.check_idempotency_key("old-key") is True
+
+    def test_purge_removes_only_expired_keys(self, temp_db: Database) -> None:
+        temp_db.add_idempotency_key("expired-key", ttl_hours=-1)
+        temp_db.add_idempotency_key("live-key")
+        assert temp_db.check_idempotency_key("expired-key") is False
+        assert temp_db.purge_expired_idempotency_keys() == 1
+        assert temp_db.purge_expired_idempotency_keys() == 0
+        assert temp_db.check_idempotency_key("live-key") is True
+
 
 class TestDatabaseOrders:
     def test_no_open_orders_initially(self, temp_db: Database) -> None:
@@ -71,6 +140,69 @@ class TestDatabaseOrders:
         assert orders[0]["order_id"] == "order-1"
         assert orders[0]["price"] == 0.55
 
+    def test_batched_orders_commit_on_flush(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "batch.db")
+        db = Database(db_path, order_commit_batch=2)
+
+        def committed_orders() -> int:
+            reader = sqlite3.connect(db_path)
+            try:
+                return reader.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+            finally:
+                reader.close()
+
+        db.save_order("order-1", "market-1", "yes", "buy", 0.5, 1.0, "paper")
+        assert len(db.get_open_orders()) == 1
+        assert committed_orders() == 0
+
+        db.save_order("order-2", "market-1", "yes", "buy", 0.5, 1.0, "paper")
+        assert committed_orders() == 2
+
+        db.save_order("order-3", "market-1", "yes", "buy", 0.5, 1.0, "paper")
+        db.flush()
+        assert committed_orders() == 3
+        db.close()
+
+    def test_batched_orders_survive_close_and_reopen(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "batch.db")
+        db = Database(db_path, order_commit_batch=5)
+        for i in range(3):
+            db.save_order(f"order-{i}", "market-1", "yes", "buy", 0.5, 1.0, "paper")
+        db.close()
+
+        reopened = Database(db_path)
+        assert [row["order_id"] for row in reopened.get_open_orders()] == ["order-0", "order-1", "order-2"]
+        reopened.close()
+
+    def test_other_commits_restart_the_order_batch(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "batch.db")
+        db = Database(db_path, order_commit_batch=2)
+
+        def committed_orders() -> int:
+            reader = sqlite3.connect(db_path)
+            try:
+                return reader.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+            finally:
+                reader.close()
+
+        db.save_order("order-1", "market-1", "yes", "buy", 0.5, 1.0, "paper")
+        db.log_action("actor", "note")
+        assert committed_orders() == 1
+
+        # The audit commit took order-1 with it, so order-2 starts a new batch
+        db.save_order("order-2", "market-1", "yes", "buy", 0.5, 1.0, "paper")
+        assert committed_orders() == 1
+        db.save_order("order-3", "market-1", "yes", "buy", 0.5, 1.0, "paper")
+        assert committed_orders() == 3
+        db.close()
+
+    def test_save_order_stamps_updated_at_with_created_at(self, temp_db: Database) -> None:
+        created = datetime(2024, 5, 17, 12, 0, tzinfo=UTC)
+        temp_db.save_order("order-1", "market-1", "yes", "buy", 0.5, 1.0, "paper", created_at=created)
+        temp_db.save_order("order-2", "market-1", "no", "buy", 0.5, 1.0, "paper", created_at=created)
+        rows = temp_db.get_open_orders()
+        assert [row["updated_at"] for row in rows] == [created.isoformat()] * 2
+
     def test_update_order_status(self, temp_db: Database) -> None:
         temp_db.save_order(
             order_id="order-1",
@@ -100,6 +232,78 @@ class TestDatabaseOrders:
         )
         assert temp_db.count_open_positions() == 1
 
+    def test_updated_at_keeps_the_given_offset(self, temp_db: Database) -> None:
+        utc_noon = datetime(2024, 1, 1, 12, tzinfo=UTC)
+        same_instant = utc_noon.astimezone(timezone(timedelta(hours=2)))
+        temp_db.save_order("order-utc", "market-1", "yes", "buy", 0.5, 1.0, "paper", created_at=utc_noon)
+        temp_db.save_order("order-plus2", "market-1", "yes", "buy", 0.5, 1.0, "paper", created_at=same_instant)
+        updated = dict(temp_db.conn.execute("SELECT order_id, updated_at FROM orders").fetchall())
+        assert updated == {
+            "order-utc": "2024-01-01T12:00:00+00:00",
+            "order-plus2": "2024-01-01T14:00:00+02:00",
+        }
+
+
+class TestDatabaseOrdersMigration:
+    """Databases created before orders.created_at became INTEGER epoch nanoseconds."""
+
+    LEGACY_CREATED_AT = datetime(2024, 5, 17, 13, 45, 12, 123456, tzinfo=UTC)
+
+    def _create_legacy_db(self, db_path: Path) -> None:
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE orders (
+                order_id TEXT PRIMARY KEY,
+                market_id TEXT NOT NULL,
+                outcome_id TEXT NOT NULL,
+                side TEXT NOT NULL,
+                price REAL NOT NULL,
+                size REAL NOT NULL,
+                status TEXT NOT NULL,
+                strategy TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE fills (
+                fill_id TEXT PRIMARY KEY,
+                order_id TEXT NOT NULL REFERENCES orders(order_id),
+                price REAL NOT NULL,
+                size REAL NOT NULL,
+                timestamp TEXT NOT NULL
+            );
+        """)
+        created = self.LEGACY_CREATED_AT.isoformat()
+        conn.execute(
+            "INSERT INTO orders VALUES ('old-1', 'market-1', 'yes', 'buy', 0.5, 10.0, 'paper', 's', ?, ?)",
+            (created, created),
+        )
+        conn.execute("INSERT INTO fills VALUES ('fill-1', 'old-1', 0.5, 10.0, ?)", (created,))
+        conn.commit()
+        conn.close()
+
+    def test_legacy_text_schema_is_migrated(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "legacy.db"
+        self._create_legacy_db(db_path)
+
+        db = Database(str(db_path))
+        engine = ExecutionEngine(db=db)
+        new_created_at = datetime(2024, 6, 1, tzinfo=UTC)
+        db.save_order("new-1", "market-2", "yes", "buy", 0.4, 5.0, "paper", created_at=new_created_at)
+
+        orders = {order.order_id: order for order in engine.get_open_orders()}
+        assert orders["old-1"].created_at == self.LEGACY_CREATED_AT
+        assert orders["new-1"].created_at == new_created_at
+        column_types = {row[1]: row[2] for row in db.conn.execute("PRAGMA table_info(orders)")}
+        assert column_types["created_at"] == "INTEGER"
+        assert [row[0] for row in db.conn.execute("SELECT typeof(created_at) FROM orders")] == [
+            "integer",
+            "integer",
+        ]
+        assert [row[0] for row in db.conn.execute("SELECT order_id FROM fills")] == ["old-1"]
+        assert db.conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        db.close()
+
 
 class TestDatabaseAuditLog:
     def test_log_action(self, temp_db: Database) -> None:
@@ -1,8 +1,14 @@
 from datetime import UTC, datetime
+from pathlib import Path
 
 from execution.engine import ExecutionEngine, OrderSizing
+from execution.slippage import within_slippage
 from risk.engine import RiskDecision
 from signals.types import Signal
+from storage.db import Database
+
+# Signal timestamps are only carried along, never compared to the clock
+FROZEN_TS = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
 
 
 def _make_signal(
@@ -19,7 +25,7 @@ def _make_signal(
         action=action,
         confidence=confidence,
         explanation={"edge": edge},
-        created_at=datetime.now(UTC),
+        created_at=FROZEN_TS,
     )
 
 
@@ -82,6 +88,31 @@ class TestExecutionEngineSubmit:
         assert result.status == "rejected"
         assert "slippage_exceeded" in result.reason
 
+    def test_duplicate_reported_before_slippage(self) -> None:
+        engine = ExecutionEngine()
+        decision = RiskDecision(approved=True, reason="approved")
+        assert engine.submit(_make_signal(), decision).status == "submitted"
+        result = engine.submit(_make_signal(), decision, current_price=0.60)
+        assert result.status == "duplicate"
+        assert result.reason == "idempotent_key"
+
+    def test_slippage_rejection_does_not_claim_key(self) -> None:
+        engine = ExecutionEngine()
+        decision = RiskDecision(approved=True, reason="approved")
+        assert engine.submit(_make_signal(), decision, current_price=0.60).status == "rejected"
+        assert engine.submit(_make_signal(), decision, current_price=0.53).status == "submitted"
+
+    def test_order_ids_unique_across_engines(self) -> None:
+        decision = RiskDecision(approved=True, reason="approved")
+        order_ids = set()
+        for engine in (ExecutionEngine(), ExecutionEngine()):
+            for market_id in ("market-1", "market-2"):
+                result = engine.submit(_make_signal(market_id=market_id), decision)
+                assert result.order is not None
+                assert result.order.order_id.startswith("order-")
+                order_ids.add(result.order.order_id)
+        assert len(order_ids) == 4
+
     def test_live_mode_status(self) -> None:
         engine = ExecutionEngine()
         engine.set_paper(False)
@@ -92,6 +123,88 @@ class TestExecutionEngineSubmit:
         assert result.order.status == "submitted"  # Not "paper"
 
 
+class TestExecutionEngineWithDatabase:
+    def test_prevents_duplicate_orders(self, tmp_path: Path) -> None:
+        db = Database(str(tmp_path / "engine.db"))
+        engine = ExecutionEngine(db=db)
+        decision = RiskDecision(approved=True, reason="approved")
+        assert engine.submit(_make_signal(), decision).status == "submitted"
+        assert engine.submit(_make_signal(), decision).status == "duplicate"
+        assert len(engine.get_open_orders()) == 1
+        orders = list(engine.iter_open_orders())
+        assert [o.market_id for o in orders] == ["test-market"]
+        db.close()
+
+    def test_duplicate_reported_before_slippage(self, tmp_path: Path) -> None:
+        db = Database(str(tmp_path / "engine.db"))
+        engine = ExecutionEngine(db=db)
+        decision = RiskDecision(approved=True, reason="approved")
+        assert engine.submit(_make_signal(), decision, current_price=0.60).status == "rejected"
+        assert engine.submit(_make_signal(), decision).status == "submitted"
+        assert engine.submit(_make_signal(), decision, current_price=0.60).status == "duplicate"
+        db.close()
+
+    def test_round_trips_created_at(self, tmp_path: Path) -> None:
+        db = Database(str(tmp_path / "engine.db"))
+        engine = ExecutionEngine(db=db)
+        decision = RiskDecision(approved=True, reason="approved")
+        result = engine.submit(_make_signal(), decision)
+        assert result.order is not None
+        assert engine.get_open_orders()[0].created_at == result.order.created_at
+        db.close()
+
+    def test_paper_orders_skip_database_when_not_persisted(self, tmp_path: Path) -> None:
+        db = Database(str(tmp_path / "engine.db"))
+        engine = ExecutionEngine(db=db, persist_paper=False)
+        decision = RiskDecision(approved=True, reason="approved")
+        result = engine.submit(_make_signal(), decision)
+        assert result.status == "submitted"
+        assert engine.submit(_make_signal(), decision).status == "duplicate"
+        assert db.get_open_orders() == []
+        assert len(engine.get_open_orders()) == 1
+
+        engine.set_paper(False)
+        engine.submit(_make_signal(market_id="live-market"), decision)
+        assert [o["market_id"] for o in db.get_open_orders()] == ["live-market"]
+        assert len(engine.get_open_orders()) == 2
+
+        assert result.order is not None
+        assert engine.cancel_order(result.order.order_id) is True
+        assert len(engine.get_open_orders()) == 1
+        db.close()
+
+    def test_close_persists_batched_orders(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "engine.db")
+        engine = ExecutionEngine(db=Database(db_path, order_commit_batch=10))
+        decision = RiskDecision(approved=True, reason="approved")
+        for market_id in ("market-1", "market-2"):
+            assert engine.submit(_make_signal(market_id=market_id), decision).status == "submitted"
+        engine.close()
+
+        reopened = Database(db_path)
+        assert sorted(o["market_id"] for o in reopened.get_open_orders()) == ["market-1", "market-2"]
+        reopened.close()
+
+
+class TestExecutionEngineSubmitMany:
+    def test_submits_batch_with_shared_timestamp(self) -> None:
+        engine = ExecutionEngine()
+        signals = [_make_signal(market_id="market-1"), _make_signal(market_id="market-2")]
+        decisions = [
+            RiskDecision(approved=True, reason="approved"),
+            RiskDecision(approved=False, reason="max_open_positions"),
+        ]
+        results = engine.submit_many(signals, decisions)
+        assert [r.status for r in results] == ["submitted", "rejected"]
+
+        signals.append(_make_signal(market_id="market-3"))
+        decisions = [RiskDecision(approved=True, reason="approved")] * 3
+        results = engine.submit_many(signals, decisions)
+        assert [r.status for r in results] == ["duplicate", "submitted", "submitted"]
+        assert results[1].order is not None and results[2].order is not None
+        assert results[1].order.created_at == results[2].order.created_at
+
+
 class TestExecutionEngineOrders:
     def test_get_open_orders_empty(self) -> None:
         engine = ExecutionEngine()
@@ -123,9 +236,27 @@ class TestExecutionEngineOrders:
 
 
 class TestOrderSizing:
+    def test_confidence_scaling_bounds(self) -> None:
+        engine = ExecutionEngine(sizing=OrderSizing(base_size=10.0))
+        assert engine._calculate_order_size(_make_signal(confidence=0.6)) == 5.0
+        assert engine._calculate_order_size(_make_signal(confidence=0.8)) == 12.5
+        assert engine._calculate_order_size(_make_signal(confidence=1.0)) == 20.0
+        assert engine._calculate_order_size(_make_signal(confidence=0.1)) == 5.0
+
     def test_default_values(self) -> None:
         sizing = OrderSizing()
         assert sizing.base_size == 10.0
         assert sizing.confidence_scaling is True
         assert sizing.min_size == 1.0
         assert sizing.max_size == 100.0
+
+
+class TestWithinSlippage:
+    def test_within_and_outside_tolerance(self) -> None:
+        assert within_slippage(0.50, 0.505, 0.02) is True
+        assert within_slippage(0.50, 0.495, 0.02) is True
+        assert within_slippage(0.50, 0.52, 0.02) is False
+
+    def test_non_positive_expected_price(self) -> None:
+        assert within_slippage(0.0, 0.0, 0.02) is False
+        assert within_slippage(-0.5, -0.5, 0.02) is False
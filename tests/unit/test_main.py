@@ -0,0 +1,17 @@
+from app.config import AppConfig
+from app.main import build_app
+
+
+def test_build_app_uses_explicit_config() -> None:
+    config = AppConfig(env="test", paper_trading=True, telegram_admins=frozenset({42}))
+    bot = build_app(config)
+    assert bot.auth.is_admin(42) is True
+    assert bot.auth.is_admin(1) is False
+    assert bot.handle_message(42, "/status").startswith("status: trading off")
+
+
+def test_build_app_wires_execution_for_shutdown() -> None:
+    bot = build_app(AppConfig(env="test", paper_trading=False, telegram_admins=frozenset()))
+    assert bot.execution is not None
+    assert bot.execution.paper is False
+    bot.close()
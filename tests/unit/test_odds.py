@@ -1,4 +1,14 @@
-from odds.normalize import american_to_implied_prob, decimal_to_implied_prob
+from datetime import UTC, datetime
+
+import pytest
+
+from odds.fair_prob import build_fair_probabilities, confidence_from_edge, devig
+from odds.normalize import (
+    american_to_implied_prob,
+    american_to_implied_probs,
+    decimal_to_implied_prob,
+    decimal_to_implied_probs,
+)
 
 
 def test_american_to_implied_prob() -> None:
@@ -8,3 +18,35 @@ def test_american_to_implied_prob() -> None:
 
 def test_decimal_to_implied_prob() -> None:
     assert round(decimal_to_implied_prob(2.0), 2) == 0.5
+
+
+def test_build_fair_probabilities() -> None:
+    captured_at = datetime(2024, 1, 1, tzinfo=UTC)
+    results = build_fair_probabilities({"yes": 0.55, "no": 0.50}, 36.0, captured_at)
+    assert [r.outcome for r in results] == ["yes", "no"]
+    assert round(sum(r.fair for r in results), 9) == 1.0
+    for result in results:
+        assert result.captured_at == captured_at
+        assert result.confidence == confidence_from_edge(result.fair - result.implied, 36.0)
+
+
+def test_devig_accepts_one_shot_iterables() -> None:
+    fair = devig(p for p in (0.6, 0.6))
+    assert fair == [0.5, 0.5]
+    assert devig([0.0, 0.0]) == [0.0, 0.0]
+
+
+def test_batch_conversions_match_scalar() -> None:
+    american = [100, -200, 150, -110]
+    assert american_to_implied_probs(american) == pytest.approx(
+        [american_to_implied_prob(value) for value in american]
+    )
+    decimal = [2.0, 1.5, 3.25]
+    assert decimal_to_implied_probs(decimal) == [decimal_to_implied_prob(value) for value in decimal]
+
+
+def test_batch_conversions_reject_invalid_odds() -> None:
+    with pytest.raises(ValueError):
+        american_to_implied_probs([100, 0])
+    with pytest.raises(ValueError):
+        decimal_to_implied_probs([2.0, 1.0])
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from polymarket.client import ClientConfig, PolymarketClient
+from polymarket.market_data import MarketDataService
+
+
+def _make_client(ttl: float = 1.0) -> PolymarketClient:
+    return PolymarketClient(
+        ClientConfig(api_base="https://example.test", api_key=None, wallet_address=None, market_cache_ttl=ttl)
+    )
+
+
+class TestMarketCache:
+    def test_get_markets_reuses_cached_fetch_within_ttl(self) -> None:
+        client = _make_client()
+        with patch.object(client, "_fetch_markets", wraps=client._fetch_markets) as fetch:
+            first = client.get_markets()
+            second = client.get_markets()
+        assert fetch.call_count == 1
+        assert first == second
+        assert first is not second
+
+    def test_get_markets_refetches_after_ttl(self) -> None:
+        client = _make_client()
+        with (
+            patch.object(client, "_fetch_markets", wraps=client._fetch_markets) as fetch,
+            patch("polymarket.client.time.monotonic", side_effect=[100.0, 100.5, 101.5]),
+        ):
+            client.get_markets()
+            client.get_markets()
+            client.get_markets()
+        assert fetch.call_count == 2
+
+    def test_get_market_refetches_after_ttl(self) -> None:
+        client = _make_client()
+        with (
+            patch.object(client, "_fetch_markets", wraps=client._fetch_markets) as fetch,
+            patch("polymarket.client.time.monotonic", side_effect=[100.0, 100.5, 101.5]),
+        ):
+            client.get_market("demo-market")
+            client.get_market("demo-market")
+            assert fetch.call_count == 1
+            assert client.get_market("demo-market").id == "demo-market"
+        assert fetch.call_count == 2
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        client = _make_client(ttl=0.0)
+        with patch.object(client, "_fetch_markets", wraps=client._fetch_markets) as fetch:
+            client.get_markets()
+            client.get_markets()
+        assert fetch.call_count == 2
+
+    def test_invalidate_forces_refetch(self) -> None:
+        client = _make_client()
+        with patch.object(client, "_fetch_markets", wraps=client._fetch_markets) as fetch:
+            client.get_markets()
+            client.invalidate()
+            assert client.get_market("demo-market").id == "demo-market"
+        assert fetch.call_count == 2
+
+
+class TestMarketDataService:
+    def test_iter_snapshots_share_capture_time(self) -> None:
+        service = MarketDataService(_make_client())
+        snapshots = list(service.iter_snapshots())
+        assert [s.market.id for s in snapshots] == ["demo-market"]
+        assert len({s.captured_at for s in snapshots}) == 1
+        assert [s.market for s in service.snapshot()] == [s.market for s in snapshots]
@@ -1,3 +1,4 @@
+from unittest.mock import patch
 
 from telegram.rate_limit import RateLimiter
 
@@ -42,3 +43,28 @@ class TestRateLimiter:
         limiter.is_allowed(user_id=123)
         limiter.is_allowed(user_id=123)
         assert limiter.remaining(user_id=123) == 2
+
+    def test_requests_expire_after_window(self) -> None:
+        limiter = RateLimiter(max_requests=2, window_seconds=60)
+        with patch("telegram.rate_limit.monotonic", side_effect=[0.0, 30.0, 59.0, 60.0, 60.0]):
+            assert limiter.is_allowed(user_id=1) is True
+            assert limiter.is_allowed(user_id=1) is True
+            assert limiter.is_allowed(user_id=1) is False
+            assert limiter.is_allowed(user_id=1) is True  # first request has left the window
+            assert limiter.remaining(user_id=1) == 0
+
+    def test_stale_users_are_evicted(self) -> None:
+        limiter = RateLimiter(max_requests=5, window_seconds=10)
+        with patch("telegram.rate_limit.monotonic", side_effect=[0.0, 5.0, 15.0, 26.0]):
+            limiter.is_allowed(user_id=1)
+            limiter.is_allowed(user_id=2)
+            limiter.is_allowed(user_id=1)
+            assert limiter.active_users() == 2
+            limiter.is_allowed(user_id=3)  # user 2 idle for 21s > 2 windows
+        assert list(limiter.requests) == [1, 3]
+
+    def test_accepts_caller_supplied_time(self) -> None:
+        limiter = RateLimiter(max_requests=1, window_seconds=60)
+        assert limiter.is_allowed(user_id=1, now=100.0) is True
+        assert limiter.is_allowed(user_id=1, now=159.0) is False
+        assert limiter.remaining(user_id=1, now=160.0) == 1
@@ -1,6 +1,19 @@
+import asyncio
+import random
+import threading
+
 import pytest
 
-from utils.retry import RetryError, retry
+from utils.retry import (
+    RetryBudget,
+    RetryError,
+    _rng,
+    retry,
+    retry_async,
+    retry_predicate,
+    retry_with_timeout,
+    retry_with_timeout_async,
+)
 
 
 class TestRetry:
@@ -108,6 +121,181 @@ class TestRetry:
         assert result == "success"
 
 
+class TestJitterModes:
+    @staticmethod
+    def _delays(monkeypatch: pytest.MonkeyPatch, **kwargs: object) -> list[float]:
+        slept: list[float] = []
+        monkeypatch.setattr("utils.retry.time.sleep", slept.append)
+
+        def operation() -> str:
+            raise ValueError("fail")
+
+        with pytest.raises(RetryError):
+            retry(operation, attempts=6, base_delay_s=1.0, max_delay_s=8.0, **kwargs)  # type: ignore[arg-type]
+        return slept
+
+    def test_jitter_false_maps_to_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert self._delays(monkeypatch, jitter=False) == [1.0, 2.0, 4.0, 8.0, 8.0]
+
+    def test_full_jitter_stays_below_backoff(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        delays = self._delays(monkeypatch, jitter_mode="full")
+        assert all(0 <= d <= cap for d, cap in zip(delays, [1.0, 2.0, 4.0, 8.0, 8.0], strict=True))
+
+    def test_custom_schedule_overrides_backoff(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        delays = self._delays(monkeypatch, jitter=False, schedule=lambda attempt: 0.1 * attempt)
+        assert delays == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+    def test_decorrelated_jitter_is_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        delays = self._delays(monkeypatch, jitter_mode="decorrelated")
+        assert len(delays) == 5
+        assert all(1.0 <= d <= 8.0 for d in delays)
+
+
+class TestDeadline:
+    @staticmethod
+    def _fake_clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        clock = [0.0]
+        slept: list[float] = []
+
+        def sleep(delay: float) -> None:
+            slept.append(delay)
+            clock[0] += delay
+
+        monkeypatch.setattr("utils.retry.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("utils.retry.time.sleep", sleep)
+        return slept
+
+    def test_sleep_is_capped_to_remaining_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        slept = self._fake_clock(monkeypatch)
+
+        def operation() -> str:
+            raise ValueError("fail")
+
+        with pytest.raises(RetryError, match="timed out") as exc_info:
+            retry(operation, attempts=10, base_delay_s=1.0, jitter=False, deadline_s=2.5)
+
+        assert slept == [1.0, 1.5]
+        assert exc_info.value.attempts == 3
+
+    def test_retry_with_timeout_delegates(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self._fake_clock(monkeypatch)
+        call_count = 0
+
+        def operation() -> str:
+            nonlocal call_count
+            call_count += 1
+            if call_count < 4:
+                raise ValueError("fail")
+            return "success"
+
+        assert retry_with_timeout(operation, timeout_s=60.0, jitter_mode="none") == "success"
+        assert call_count == 4
+
+
+class TestThreadLocalRng:
+    def test_each_thread_gets_its_own_rng(self) -> None:
+        rngs: list[random.Random] = []
+        thread = threading.Thread(target=lambda: rngs.append(_rng()))
+        thread.start()
+        thread.join()
+
+        assert _rng() is _rng()
+        assert rngs[0] is not _rng()
+
+
+class TestRetryBudget:
+    def test_refills_over_time(self) -> None:
+        budget = RetryBudget(capacity=2, refill_per_s=1.0)
+        start = budget._updated
+
+        assert budget.try_consume(now=start)
+        assert budget.try_consume(now=start)
+        assert not budget.try_consume(now=start)
+        assert budget.try_consume(now=start + 1.0)
+
+    def test_exhausted_budget_reraises(self) -> None:
+        budget = RetryBudget(capacity=1, refill_per_s=0.0)
+        call_count = 0
+
+        def operation() -> str:
+            nonlocal call_count
+            call_count += 1
+            raise ValueError("fail")
+
+        with pytest.raises(ValueError):
+            retry(operation, attempts=5, base_delay_s=0.0, jitter=False, budget=budget)
+
+        assert call_count == 2
+
+
+class TestNonPositiveTimeout:
+    @pytest.mark.parametrize("timeout_s", [0.0, -1.0])
+    def test_runs_no_attempts(self, timeout_s: float) -> None:
+        calls: list[int] = []
+
+        async def operation_async() -> str:
+            calls.append(1)
+            return "ran"
+
+        with pytest.raises(RetryError, match="timed out") as exc_info:
+            retry_with_timeout(lambda: calls.append(1), timeout_s=timeout_s)
+        assert exc_info.value.attempts == 0
+
+        with pytest.raises(RetryError, match="timed out"):
+            asyncio.run(retry_with_timeout_async(operation_async, timeout_s=timeout_s))
+        assert calls == []
+
+
+class TestRetryAsync:
+    def test_retries_until_success(self) -> None:
+        call_count = 0
+
+        async def operation() -> str:
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                raise ValueError("fail")
+            return "success"
+
+        result = asyncio.run(retry_async(operation, attempts=3, base_delay_s=0.0, jitter=False))
+        assert result == "success"
+        assert call_count == 3
+
+    def test_raises_after_max_attempts(self) -> None:
+        async def operation() -> str:
+            raise ValueError("always fails")
+
+        with pytest.raises(RetryError) as exc_info:
+            asyncio.run(retry_async(operation, attempts=2, base_delay_s=0.0, jitter=False))
+
+        assert exc_info.value.attempts == 2
+
+    def test_timeout_cuts_off_hung_attempt(self) -> None:
+        async def operation() -> str:
+            await asyncio.sleep(10)
+            return "late"
+
+        with pytest.raises(RetryError, match="timed out"):
+            asyncio.run(retry_with_timeout_async(operation, timeout_s=0.05, base_delay_s=0.01))
+
+
+class TestRetryPredicate:
+    def test_polls_until_predicate_accepts(self) -> None:
+        values = iter([None, None, "ready"])
+
+        result = retry_predicate(
+            lambda: next(values), lambda v: v is not None, attempts=5, base_delay_s=0.0, jitter=False
+        )
+        assert result == "ready"
+
+    def test_raises_when_never_accepted(self) -> None:
+        with pytest.raises(RetryError) as exc_info:
+            retry_predicate(lambda: 0, bool, attempts=3, base_delay_s=0.0, jitter=False)
+
+        assert exc_info.value.attempts == 3
+        assert exc_info.value.last_error is None
+
+
 class TestRetryError:
     def test_error_attributes(self) -> None:
         original = ValueError("original error")
@@ -1,141 +1,207 @@
-from datetime import UTC, datetime
+from collections.abc import Callable, Mapping
+from dataclasses import FrozenInstanceError
+from typing import Any
+
+import pytest
 
 from risk.engine import MIN_CONFIDENCE_THRESHOLD, RiskDecision, RiskEngine, RiskState
 from risk.limits import RiskLimits
 from signals.types import Signal
 
-
-def _make_signal(
-    confidence: float = 0.7,
-    strategy: str = "test_strategy",
-    market_id: str = "test-market",
-) -> Signal:
-    return Signal(
-        strategy=strategy,
-        market_id=market_id,
-        outcome_id="yes",
-        action="buy",
-        confidence=confidence,
-        explanation={"test": "data"},
-        created_at=datetime.now(UTC),
-    )
+SignalFactory = Callable[..., Signal]
+
+
+@pytest.fixture
+def make_signal(base_signal_kwargs: Mapping[str, Any]) -> SignalFactory:
+    def factory(confidence: float = 0.7, **overrides: Any) -> Signal:
+        return Signal(**{**base_signal_kwargs, **overrides}, confidence=confidence)
+
+    return factory
+
+
+@pytest.fixture
+def fresh_engine() -> RiskEngine:
+    return RiskEngine()
+
+
+# Shared limit templates; RiskLimits is frozen, so set_limit() never mutates these
+_LIMITS_DEFAULT = RiskLimits()
+_LIMITS_POS5 = RiskLimits(max_open_positions=5)
+_LIMITS_DAILY100 = RiskLimits(max_daily_loss=100.0)
+_LIMITS_ORDER50 = RiskLimits(max_order_size=50.0)
+_LIMITS_POSSZ100 = RiskLimits(max_position_size=100.0)
+_LIMITS_CAP = RiskLimits(strategy_caps={"test_strategy": 20.0})
+
+# (limits, evaluate() kwargs, signal confidence, expected rejection reason)
+REJECT_CASES: list[tuple[RiskLimits, dict[str, float], float, str]] = [
+    (_LIMITS_DEFAULT, {"current_positions": 0}, 0.5, "confidence_below_threshold"),
+    (_LIMITS_POS5, {"current_positions": 5}, 0.7, "max_open_positions"),
+    (
+        _LIMITS_DAILY100,
+        {"current_positions": 0, "daily_pnl": -100.0},
+        0.7,
+        "max_daily_loss_exceeded",
+    ),
+    (
+        _LIMITS_ORDER50,
+        {"current_positions": 0, "order_size": 60.0},
+        0.7,
+        "order_size_exceeded",
+    ),
+    (
+        _LIMITS_POSSZ100,
+        {"current_positions": 0, "position_size": 80.0, "order_size": 30.0},
+        0.7,
+        "max_position_size_exceeded",
+    ),
+    (
+        _LIMITS_CAP,
+        {"current_positions": 0, "order_size": 25.0},
+        0.7,
+        "strategy_cap_exceeded",
+    ),
+]
+
+# Cases expressible as a shared RiskState (batch_evaluate carries no order or position size)
+BATCH_REJECT_CASES = [case for case in REJECT_CASES if case[1].keys() <= {"current_positions", "daily_pnl"}]
 
 
 class TestRiskEngineDefaults:
-    def test_trading_disabled_by_default(self) -> None:
-        engine = RiskEngine()
-        assert engine.trading_enabled is False
+    def test_trading_disabled_by_default(self, fresh_engine: RiskEngine) -> None:
+        assert fresh_engine.trading_enabled is False
 
     def test_confidence_threshold_is_0_6(self) -> None:
         assert MIN_CONFIDENCE_THRESHOLD == 0.6
 
 
 class TestRiskEngineLimits:
-    def test_set_limit_rejects_negative(self) -> None:
-        engine = RiskEngine()
-        assert engine.set_limit("max_order_size", -1.0) is False
+    def test_set_limit_rejects_negative(self, fresh_engine: RiskEngine) -> None:
+        assert fresh_engine.set_limit("max_order_size", -1.0) is False
 
-    def test_set_limit_casts_int(self) -> None:
-        engine = RiskEngine()
-        assert engine.set_limit("max_open_positions", 7.8) is True
-        assert engine.limits.max_open_positions == 7
+    def test_set_limit_casts_int(self, fresh_engine: RiskEngine) -> None:
+        assert fresh_engine.set_limit("max_open_positions", 7.8) is True
+        assert fresh_engine.limits.max_open_positions == 7
 
-    def test_set_limit_strategy_cap(self) -> None:
-        engine = RiskEngine()
-        assert engine.set_limit("strategy.vegas_value", 12.5) is True
-        assert engine.limits.strategy_caps == {"vegas_value": 12.5}
+    def test_set_limit_strategy_cap(self, fresh_engine: RiskEngine) -> None:
+        assert fresh_engine.set_limit("strategy.vegas_value", 12.5) is True
+        assert fresh_engine.limits.strategy_caps == {"vegas_value": 12.5}
 
-    def test_set_limit_unknown_param(self) -> None:
-        engine = RiskEngine()
-        assert engine.set_limit("unknown_param", 10.0) is False
+    def test_set_limit_leaves_shared_limits_untouched(self) -> None:
+        engine = RiskEngine(limits=_LIMITS_CAP)
+        assert engine.set_limit("max_order_size", 5.0) is True
+        assert engine.set_limit("strategy.other", 1.0) is True
+        assert engine.limits.max_order_size == 5.0
+        assert engine.limits.strategy_caps == {"test_strategy": 20.0, "other": 1.0}
+        assert _LIMITS_CAP.max_order_size == 50.0
+        assert _LIMITS_CAP.strategy_caps == {"test_strategy": 20.0}
+
+    def test_set_limit_unknown_param(self, fresh_engine: RiskEngine) -> None:
+        assert fresh_engine.set_limit("unknown_param", 10.0) is False
+
+    def test_set_limit_rejects_non_limit_attributes(self, fresh_engine: RiskEngine) -> None:
+        assert fresh_engine.set_limit("strategy_caps", 10.0) is False
+        assert fresh_engine.set_limit("cap_for_strategy", 10.0) is False
+        assert fresh_engine.limits.strategy_caps is None
+        assert fresh_engine.limits.cap_for_strategy("any") == fresh_engine.limits.max_order_size
 
 
 class TestRiskEngineEvaluate:
-    def test_rejects_when_trading_disabled(self) -> None:
+    def test_rejects_when_trading_disabled(self, make_signal: SignalFactory) -> None:
         engine = RiskEngine()
-        signal = _make_signal()
+        signal = make_signal()
         decision = engine.evaluate(signal, current_positions=0)
         assert decision.approved is False
         assert decision.reason == "global_kill_switch"
 
-    def test_approves_when_trading_enabled(self) -> None:
+    def test_approves_when_trading_enabled(self, make_signal: SignalFactory) -> None:
         engine = RiskEngine()
         engine.set_trading(True)
-        signal = _make_signal(confidence=0.7)
+        signal = make_signal(confidence=0.7)
         decision = engine.evaluate(signal, current_positions=0)
         assert decision.approved is True
         assert decision.reason == "approved"
 
-    def test_rejects_low_confidence(self) -> None:
-        engine = RiskEngine()
-        engine.set_trading(True)
-        signal = _make_signal(confidence=0.5)  # Below 0.6 threshold
-        decision = engine.evaluate(signal, current_positions=0)
-        assert decision.approved is False
-        assert decision.reason == "confidence_below_threshold"
-
-    def test_rejects_max_positions_exceeded(self) -> None:
-        engine = RiskEngine(limits=RiskLimits(max_open_positions=5))
-        engine.set_trading(True)
-        signal = _make_signal()
-        decision = engine.evaluate(signal, current_positions=5)
-        assert decision.approved is False
-        assert decision.reason == "max_open_positions"
-
-    def test_rejects_daily_loss_exceeded(self) -> None:
-        engine = RiskEngine(limits=RiskLimits(max_daily_loss=100.0))
-        engine.set_trading(True)
-        signal = _make_signal()
-        decision = engine.evaluate(signal, current_positions=0, daily_pnl=-100.0)
-        assert decision.approved is False
-        assert decision.reason == "max_daily_loss_exceeded"
-
-    def test_rejects_order_size_exceeded(self) -> None:
-        engine = RiskEngine(limits=RiskLimits(max_order_size=50.0))
-        engine.set_trading(True)
-        signal = _make_signal()
-        decision = engine.evaluate(signal, current_positions=0, order_size=60.0)
-        assert decision.approved is False
-        assert decision.reason == "order_size_exceeded"
-
-    def test_rejects_position_size_exceeded(self) -> None:
-        engine = RiskEngine(limits=RiskLimits(max_position_size=100.0))
-        engine.set_trading(True)
-        signal = _make_signal()
-        decision = engine.evaluate(
-            signal, current_positions=0, position_size=80.0, order_size=30.0
-        )
-        assert decision.approved is False
-        assert decision.reason == "max_position_size_exceeded"
-
-    def test_rejects_strategy_cap_exceeded(self) -> None:
-        limits = RiskLimits(strategy_caps={"test_strategy": 20.0})
+    @pytest.mark.parametrize(
+        ("limits", "kwargs", "confidence", "reason"), REJECT_CASES, ids=[c[-1] for c in REJECT_CASES]
+    )
+    def test_rejects(
+        self,
+        make_signal: SignalFactory,
+        limits: RiskLimits,
+        kwargs: dict[str, float],
+        confidence: float,
+        reason: str,
+    ) -> None:
         engine = RiskEngine(limits=limits)
         engine.set_trading(True)
-        signal = _make_signal(strategy="test_strategy")
-        decision = engine.evaluate(signal, current_positions=0, order_size=25.0)
+        decision = engine.evaluate(make_signal(confidence=confidence), **kwargs)
         assert decision.approved is False
-        assert decision.reason == "strategy_cap_exceeded"
+        assert decision.reason == reason
+
+    def test_decisions_are_shared_and_immutable(self, make_signal: SignalFactory) -> None:
+        engine = RiskEngine()
+        first = engine.evaluate(make_signal(), current_positions=0)
+        second = engine.evaluate(make_signal(), current_positions=0)
+        assert first is second
+        with pytest.raises(FrozenInstanceError):
+            first.approved = True  # type: ignore[misc]
 
 
 class TestRiskEngineBatchEvaluate:
-    def test_batch_evaluate_returns_list(self) -> None:
+    def test_batch_evaluate_returns_list(self, make_signal: SignalFactory) -> None:
         engine = RiskEngine()
         engine.set_trading(True)
-        signals = [_make_signal(confidence=0.7), _make_signal(confidence=0.8)]
+        signals = [make_signal(confidence=0.7), make_signal(confidence=0.8)]
         decisions = engine.batch_evaluate(signals)
         assert len(decisions) == 2
         assert all(isinstance(d, RiskDecision) for d in decisions)
 
-    def test_batch_evaluate_with_risk_state(self) -> None:
+    def test_batch_evaluate_with_risk_state(self, make_signal: SignalFactory) -> None:
         engine = RiskEngine()
         engine.set_trading(True)
-        signals = [_make_signal(confidence=0.7)]
+        signals = [make_signal(confidence=0.7)]
         risk_state = RiskState(current_positions=0, daily_pnl=0.0)
         decisions = engine.batch_evaluate(signals, risk_state)
         assert len(decisions) == 1
         assert decisions[0].approved is True
 
+    def test_batch_evaluate_matches_evaluate(self, make_signal: SignalFactory) -> None:
+        engine = RiskEngine(RiskLimits(max_open_positions=3, strategy_caps={"test_strategy": 0.0}))
+        signals = [make_signal(confidence=c) for c in (0.5, 0.6, 0.9)]
+        states = [
+            RiskState(),
+            RiskState(current_positions=3),
+            RiskState(daily_pnl=-150.0),
+        ]
+        for enabled in (False, True):
+            engine.set_trading(enabled)
+            for state in states:
+                expected = [
+                    engine.evaluate(s, current_positions=state.current_positions, daily_pnl=state.daily_pnl)
+                    for s in signals
+                ]
+                assert engine.batch_evaluate(signals, state) == expected
+
+    @pytest.mark.parametrize(
+        ("limits", "kwargs", "confidence", "reason"),
+        BATCH_REJECT_CASES,
+        ids=[c[-1] for c in BATCH_REJECT_CASES],
+    )
+    def test_batch_rejects_like_evaluate(
+        self,
+        make_signal: SignalFactory,
+        limits: RiskLimits,
+        kwargs: dict[str, float],
+        confidence: float,
+        reason: str,
+    ) -> None:
+        engine = RiskEngine(limits=limits)
+        engine.set_trading(True)
+        signals = [make_signal(confidence=confidence), make_signal(confidence=confidence)]
+        decisions = engine.batch_evaluate(signals, RiskState(**kwargs))  # type: ignore[arg-type]
+        assert [d.reason for d in decisions] == [reason, reason]
+        assert decisions == [engine.evaluate(s, **kwargs) for s in signals]  # type: ignore[arg-type]
+
 
 class TestRiskState:
     def test_default_values(self) -> None:
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from signals.engine import SignalEngine
+from signals.strategies.drift_late_info import LateInfoDriftStrategy
+
+
+class TestSignalEngine:
+    def test_evaluate_stamps_signals_with_batch_time(self) -> None:
+        batch = SignalEngine().evaluate()
+        assert len(batch.signals) == 6
+        assert {signal.created_at for signal in batch.signals} == {batch.created_at}
+
+    def test_generate_uses_given_time(self) -> None:
+        now = datetime(2024, 5, 17, 12, 0, tzinfo=UTC)
+        signals = LateInfoDriftStrategy().generate(now)
+        assert [signal.created_at for signal in signals] == [now]
@@ -1,29 +1,106 @@
 from __future__ import annotations
 
+import logging
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
 from risk.engine import RiskEngine
 from signals.engine import SignalEngine
+from storage.db import Database
 from telegram.auth import TelegramAuth
 from telegram.commands import CommandHandler
 
 
-def _handler() -> CommandHandler:
+def _new_handler() -> CommandHandler:
     auth = TelegramAuth(admin_ids={1})
     return CommandHandler(auth=auth, risk=RiskEngine(), signals=SignalEngine())
 
 
-def test_trade_requires_on_off() -> None:
-    handler = _handler()
-    response = handler.handle(1, "/trade")
-    assert response.text == "usage: /trade on|off"
+@pytest.fixture(scope="module")
+def _shared_handler() -> CommandHandler:
+    return _new_handler()
+
+
+@pytest.fixture
+def handler(_shared_handler: CommandHandler) -> CommandHandler:
+    """Module-wide handler for tests that leave risk/signal state alone; rate limits are reset."""
+    _shared_handler.rate_limiter.requests.clear()
+    return _shared_handler
+
+
+@pytest.fixture
+def fresh_handler() -> CommandHandler:
+    """Private handler for tests that change limits or engine state."""
+    return _new_handler()
+
+
+@pytest.mark.parametrize(
+    ("command", "expected"),
+    [
+        ("/trade", "usage: /trade on|off"),
+        ("/paper maybe", "usage: /paper on|off"),
+        ("/strategy toggle vegas", "usage: /strategy enable|disable <name>"),
+    ],
+)
+def test_usage_error(handler: CommandHandler, command: str, expected: str) -> None:
+    assert handler.handle(1, command).text == expected
+
+
+def test_dispatch_matches_whole_verb(handler: CommandHandler) -> None:
+    assert handler.handle(1, "/markets").text == "markets: demo-market"
+    assert handler.handle(1, "/markets@polysport_bot").text == "markets: demo-market"
+    assert handler.handle(1, "/marketsx").text.startswith("unknown command")
+    assert handler.handle(1, "/strategies").text.startswith("unknown command")
+    assert handler.handle(1, "   ").text.startswith("unknown command")
+
+
+def test_admin_commands_commit_audit_with_state(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "bot.db")
+    db = Database(db_path)
+    handler = CommandHandler(auth=TelegramAuth(admin_ids={1}), risk=RiskEngine(), signals=SignalEngine(), db=db)
+    assert handler.handle(1, "/trade on").text == "trade on"
+    assert handler.handle(1, "/watchlist add market-1").text == "watchlist add market-1"
+
+    reader = sqlite3.connect(db_path)
+    try:
+        actions = [row[0] for row in reader.execute("SELECT action FROM audit_log ORDER BY id")]
+        trading = reader.execute("SELECT trading_enabled FROM risk_state").fetchone()[0]
+        watchlist = [row[0] for row in reader.execute("SELECT market_id FROM watchlist")]
+    finally:
+        reader.close()
+    assert actions == ["trade_toggle", "watchlist_update"]
+    assert trading == 1
+    assert watchlist == ["market-1"]
+    db.close()
+
+
+def test_extra_arguments_are_still_rejected(fresh_handler: CommandHandler) -> None:
+    assert fresh_handler.handle(1, "/trade on " + "x " * 1000).text == "usage: /trade on|off"
+    assert fresh_handler.handle(1, "/risk set max_order_size 10 " + "x " * 1000).text == "risk max_order_size set to 10.0"
+
 
+def test_unknown_commands_do_not_consume_rate_limit(fresh_handler: CommandHandler) -> None:
+    fresh_handler.rate_limiter.max_requests = 1
+    for _ in range(5):
+        assert fresh_handler.handle(2, "/nope").text.startswith("unknown command")
+    assert fresh_handler.rate_limiter.active_users() == 0
+    assert fresh_handler.handle(2, "/markets").text == "markets: demo-market"
+    assert fresh_handler.handle(2, "/markets").text == "Rate limit exceeded. Please wait."
 
-def test_paper_requires_on_off() -> None:
-    handler = _handler()
-    response = handler.handle(1, "/paper maybe")
-    assert response.text == "usage: /paper on|off"
 
+def test_command_log_skips_sanitizing_when_info_disabled(
+    handler: CommandHandler, caplog: pytest.LogCaptureFixture
+) -> None:
+    with (
+        caplog.at_level(logging.WARNING, logger="telegram.commands"),
+        patch("telegram.commands.sanitize_log_message") as sanitize,
+    ):
+        handler.handle(1, "/markets")
+    sanitize.assert_not_called()
 
-def test_strategy_requires_enable_disable() -> None:
-    handler = _handler()
-    response = handler.handle(1, "/strategy toggle vegas")
-    assert response.text == "usage: /strategy enable|disable <name>"
+    with caplog.at_level(logging.INFO, logger="telegram.commands"):
+        handler.handle(1, "/markets")
+    assert [r.command for r in caplog.records if r.msg == "telegram_command_received"] == ["/markets"]
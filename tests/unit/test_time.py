@@ -0,0 +1,24 @@
+from datetime import UTC, datetime
+
+from utils.time import from_epoch_ns, parse_stored_timestamp, to_epoch_ns
+
+
+def test_epoch_ns_round_trip_is_exact() -> None:
+    value = datetime(2024, 5, 17, 13, 45, 12, 123456, tzinfo=UTC)
+    assert to_epoch_ns(value) == 1715953512123456000
+    assert from_epoch_ns(to_epoch_ns(value)) == value
+
+
+def test_parse_stored_timestamp_accepts_legacy_iso_text() -> None:
+    value = datetime(2024, 5, 17, 13, 45, 12, tzinfo=UTC)
+    assert parse_stored_timestamp(value.isoformat()) == value
+    assert parse_stored_timestamp(to_epoch_ns(value)) == value
+
+
+def test_parse_stored_timestamp_accepts_zulu_suffix() -> None:
+    assert parse_stored_timestamp("2024-05-17T13:45:12Z") == datetime(2024, 5, 17, 13, 45, 12, tzinfo=UTC)
+
+
+def test_parse_stored_timestamp_accepts_digit_string() -> None:
+    value = datetime(2024, 5, 17, 13, 45, 12, 123456, tzinfo=UTC)
+    assert parse_stored_timestamp(str(to_epoch_ns(value))) == value
@@ -1,3 +1,7 @@
+import re
+
+import pytest
+
 from telegram.validation import (
     sanitize_log_message,
     validate_market_id,
@@ -6,56 +10,78 @@ from telegram.validation import (
     validate_strategy_name,
 )
 
+# C0 control characters other than tab, newline and carriage return
+_CTRL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Over-length inputs, built once at import
+_S100 = "a" * 100
+_S200 = "a" * 200
+_S600 = "a" * 600
+
+STRATEGY_CASES = [
+    ("vegas_value", True),
+    ("smart-money", True),
+    ("Strategy123", True),
+    ("", False),
+    (_S100, False),  # Too long
+    ("name with spaces", False),
+    ("name@special", False),
+    ("<script>", False),
+    ("vegas_value\n", False),
+]
+
+MARKET_ID_CASES = [
+    ("market-123", True),
+    ("abc_def_ghi", True),
+    ("MarketID", True),
+    ("", False),
+    (_S200, False),  # Too long
+    ("id with space", False),
+    ("../../../etc", False),
+    ("market-123\n", False),
+]
+
+PARAM_CASES = [
+    ("max_order_size", True),
+    ("strategy.vegas", True),
+    ("limit123", True),
+    ("", False),
+    ("param with space", False),
+    ("param@special", False),
+]
+
+NUMERIC_CASES = [
+    ("10.5", 10.5),
+    ("100", 100.0),
+    ("0", 0.0),
+    ("abc", None),
+    ("-10", None),  # Below min
+    ("1e20", None),  # Above max
+]
 
-class TestValidateStrategyName:
-    def test_valid_names(self) -> None:
-        assert validate_strategy_name("vegas_value") is True
-        assert validate_strategy_name("smart-money") is True
-        assert validate_strategy_name("Strategy123") is True
 
-    def test_invalid_names(self) -> None:
-        assert validate_strategy_name("") is False
-        assert validate_strategy_name("a" * 100) is False  # Too long
-        assert validate_strategy_name("name with spaces") is False
-        assert validate_strategy_name("name@special") is False
-        assert validate_strategy_name("<script>") is False
+class TestValidateStrategyName:
+    @pytest.mark.parametrize(("value", "expected"), STRATEGY_CASES)
+    def test_validate(self, value: str, expected: bool) -> None:
+        assert validate_strategy_name(value) is expected
 
 
 class TestValidateMarketId:
-    def test_valid_ids(self) -> None:
-        assert validate_market_id("market-123") is True
-        assert validate_market_id("abc_def_ghi") is True
-        assert validate_market_id("MarketID") is True
-
-    def test_invalid_ids(self) -> None:
-        assert validate_market_id("") is False
-        assert validate_market_id("a" * 200) is False  # Too long
-        assert validate_market_id("id with space") is False
-        assert validate_market_id("../../../etc") is False
+    @pytest.mark.parametrize(("value", "expected"), MARKET_ID_CASES)
+    def test_validate(self, value: str, expected: bool) -> None:
+        assert validate_market_id(value) is expected
 
 
 class TestValidateParamName:
-    def test_valid_params(self) -> None:
-        assert validate_param_name("max_order_size") is True
-        assert validate_param_name("strategy.vegas") is True
-        assert validate_param_name("limit123") is True
-
-    def test_invalid_params(self) -> None:
-        assert validate_param_name("") is False
-        assert validate_param_name("param with space") is False
-        assert validate_param_name("param@special") is False
+    @pytest.mark.parametrize(("value", "expected"), PARAM_CASES)
+    def test_validate(self, value: str, expected: bool) -> None:
+        assert validate_param_name(value) is expected
 
 
 class TestValidateNumericValue:
-    def test_valid_values(self) -> None:
-        assert validate_numeric_value("10.5") == 10.5
-        assert validate_numeric_value("100") == 100.0
-        assert validate_numeric_value("0") == 0.0
-
-    def test_invalid_values(self) -> None:
-        assert validate_numeric_value("abc") is None
-        assert validate_numeric_value("-10") is None  # Below min
-        assert validate_numeric_value("1e20") is None  # Above max
+    @pytest.mark.parametrize(("value", "expected"), NUMERIC_CASES)
+    def test_validate(self, value: str, expected: float | None) -> None:
+        assert validate_numeric_value(value) == expected
 
     def test_custom_bounds(self) -> None:
         assert validate_numeric_value("5", min_val=1.0, max_val=10.0) == 5.0
@@ -68,19 +94,25 @@ class TestSanitizeLogMessage:
         assert sanitize_log_message("Hello World") == "Hello World"
 
     def test_truncates_long_message(self) -> None:
-        long_msg = "a" * 600
-        result = sanitize_log_message(long_msg)
+        result = sanitize_log_message(_S600)
         assert len(result) == 503  # 500 + "..."
         assert result.endswith("...")
 
     def test_removes_control_characters(self) -> None:
         msg = "Hello\x00World\x1b[31m"
         result = sanitize_log_message(msg)
-        assert "\x00" not in result
-        assert "\x1b" not in result
+        assert _CTRL_RE.search(result) is None
 
     def test_preserves_whitespace(self) -> None:
         msg = "Hello\nWorld\tTest"
         result = sanitize_log_message(msg)
         assert "\n" in result
         assert "\t" in result
+
+    def test_replaces_non_ascii_format_characters(self) -> None:
+        assert sanitize_log_message("a​b­c é") == "a?b?c é"
+        # Second call is served from the cached translation table
+        assert sanitize_log_message("a​b") == "a?b"
+
+    def test_truncates_before_sanitizing(self) -> None:
+        assert sanitize_log_message("\x00" * 600, max_length=3) == "???..."
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from wallets.features import FEATURE_NAMES, WalletFeatures
+from wallets.scoring import WalletScoringEngine
+from wallets.tracker import WalletTracker
+
+
+def _features(roi: float) -> WalletFeatures:
+    return WalletFeatures(roi=roi, win_rate=0.5, drawdown_proxy=0.1, timing_edge=0.2, market_selectivity=0.3)
+
+
+class TestWalletTracker:
+    def test_leaderboard_orders_by_score_and_limits(self) -> None:
+        tracker = WalletTracker()
+        for wallet, roi in [("a", 0.1), ("b", 0.9), ("c", 0.5), ("d", 0.7)]:
+            tracker.ingest(wallet, _features(roi))
+        assert [s.wallet for s in tracker.leaderboard(limit=3)] == ["b", "d", "c"]
+
+    def test_leaderboard_ties_keep_ingest_order(self) -> None:
+        tracker = WalletTracker()
+        for wallet in ("x", "y", "z"):
+            tracker.ingest(wallet, _features(0.4))
+        assert [s.wallet for s in tracker.leaderboard(limit=2)] == ["x", "y"]
+
+    def test_reingest_replaces_previous_score(self) -> None:
+        tracker = WalletTracker()
+        for wallet, roi in [("a", 0.9), ("b", 0.5), ("a", 0.1)]:
+            tracker.ingest(wallet, _features(roi))
+        assert [s.wallet for s in tracker.leaderboard()] == ["b", "a"]
+        assert [s.wallet for s in tracker.leaderboard(limit=1)] == ["b"]
+
+    def test_leaderboard_matches_full_rescore(self) -> None:
+        tracker = WalletTracker()
+        for i in range(200):
+            tracker.ingest(f"w{i % 37}", _features((i * 7919) % 101 / 100))
+        expected = tracker.watchlist.top(tracker.scoring, limit=10)
+        assert [(s.wallet, s.score) for s in tracker.leaderboard(limit=10)] == [
+            (s.wallet, s.score) for s in expected
+        ]
+
+    def test_snapshot_timestamp_materializes_lazily(self) -> None:
+        before = datetime.now(UTC)
+        snapshot = WalletTracker().ingest("a", _features(0.1))
+        assert isinstance(snapshot.captured_at_ns, int)
+        assert before - timedelta(seconds=1) <= snapshot.captured_at <= datetime.now(UTC)
+
+    def test_wallet_records_are_slotted(self) -> None:
+        snapshot = WalletTracker().ingest("a", _features(0.1))
+        score = WalletScoringEngine().score("a", snapshot.features)
+        for record in (snapshot, snapshot.features, score):
+            assert not hasattr(record, "__dict__")
+        assert hash(score) == hash(WalletScoringEngine().score("a", snapshot.features))
+
+    def test_leaderboard_empty(self) -> None:
+        assert WalletTracker().leaderboard() == []
+
+
+class TestWalletScoringEngine:
+    def test_score_matches_weighted_feature_sum(self) -> None:
+        weights = {"roi": 0.5, "timing_edge": 0.25}
+        features = _features(0.8)
+        score = WalletScoringEngine(weights).score("w", features)
+        expected = sum(features.as_dict()[key] * weight for key, weight in weights.items())
+        assert score.score == pytest.approx(expected)
+
+    def test_feature_views_follow_feature_names(self) -> None:
+        features = _features(0.8)
+        assert features.as_tuple() == tuple(features.as_dict()[name] for name in FEATURE_NAMES)
+        assert list(features.as_dict()) == list(FEATURE_NAMES)
+
+    def test_non_finite_weight_rejected(self) -> None:
+        with pytest.raises(ValueError, match="finite"):
+            WalletScoringEngine({"roi": float("nan")})
+
+    def test_unknown_weight_rejected(self) -> None:
+        with pytest.raises(ValueError, match="sharpe"):
+            WalletScoringEngine({"roi": 1.0, "sharpe": 0.5})